@@ -0,0 +1,182 @@
+"""
+Reduced-resolution decode benchmark.
+
+Decodes a synthetic set of large images into a preview box and a
+thumbnail box, comparing the paths the app used before (plain
+Image.thumbnail, QImage + scaled) against the reduced ones: PIL
+draft to the target size, QImageReader scaled reads and OpenCV
+IMREAD_REDUCED_*.
+
+    python -m benchmarks.bench_decode --count 12 --size 6000x4000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from benchmarks.dataset_gen import FORMATS as SUFFIXES, generate_dataset
+from core.image_decode import decode_reduced
+
+
+FORMATS = ("jpg", "png", "webp")
+
+TARGETS = {
+    "preview": (700, 800),
+    "thumbnail": (260, 260),  # GalleryWidget.thumb_size
+}
+
+
+# ---------------------------------------------------------
+# Decode Paths
+# ---------------------------------------------------------
+
+def reduced_scale(size, max_width, max_height):
+    """
+    Smallest JPEG DCT scale (1, 2, 4 or 8) that still covers the
+    fitted target, as decode_reduced() picks it.
+    """
+    width, height = size
+    ratio = min(max_width / width, max_height / height, 1.0)
+    target_width, target_height = width * ratio, height * ratio
+    scale = 1
+
+    while (
+        scale < 8
+        and width // (scale * 2) >= target_width
+        and height // (scale * 2) >= target_height
+    ):
+        scale *= 2
+
+    return scale
+
+
+def pil_baseline(path, box):
+    """Previous thumbnail path: Image.thumbnail with its defaults."""
+    with Image.open(path) as img:
+        img.thumbnail(box)
+        img.load()
+    return img.size
+
+
+def pil_reduced(path, box):
+    return decode_reduced(path, *box).size
+
+
+def qt_full(path, box):
+    """Previous preview path: QPixmap(path).scaled(...), as QImage."""
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QImage
+
+    image = QImage(str(path)).scaled(
+        box[0], box[1], Qt.KeepAspectRatio, Qt.SmoothTransformation
+    )
+    return image.width(), image.height()
+
+
+def qt_reduced(path, box):
+    from core.image_decode import read_scaled_qimage
+
+    image = read_scaled_qimage(path, *box)
+    return image.width(), image.height()
+
+
+def cv2_reduced(path, box):
+    import cv2
+
+    with Image.open(path) as img:
+        scale = reduced_scale(img.size, *box)
+
+    flags = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }[scale]
+
+    pixels = cv2.imread(str(path), flags)
+    height, width = pixels.shape[:2]
+    ratio = min(box[0] / width, box[1] / height, 1.0)
+    pixels = cv2.resize(
+        pixels, (max(1, round(width * ratio)), max(1, round(height * ratio))),
+        interpolation=cv2.INTER_AREA
+    )
+    return pixels.shape[1], pixels.shape[0]
+
+
+def available_methods():
+    methods = {"pil_baseline": pil_baseline, "pil_reduced": pil_reduced}
+
+    try:
+        from PySide6.QtGui import QImage  # noqa: F401
+        methods["qt_full"] = qt_full
+        methods["qt_reduced"] = qt_reduced
+    except ImportError:
+        pass
+
+    try:
+        import cv2  # noqa: F401
+        methods["cv2_reduced"] = cv2_reduced
+    except ImportError:
+        pass
+
+    return methods
+
+
+def time_method(fn, paths, box, repeat):
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            fn(path, box)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=12)
+    parser.add_argument("--size", default="6000x4000")
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    methods = available_methods()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_dataset(
+            folder, args.count, formats=",".join(FORMATS),
+            resolutions=args.size, content="photo"
+        )
+
+        for fmt in FORMATS:
+            suffix = SUFFIXES[fmt][0]
+            subset = [p for p in paths if p.suffix == suffix]
+            if not subset:
+                continue
+
+            for target, box in TARGETS.items():
+                print(f"{suffix[1:]:5} → {target} {box[0]}×{box[1]}")
+                baseline = None
+
+                for name, fn in methods.items():
+                    elapsed = time_method(fn, subset, box, args.repeat)
+                    per_image = elapsed / len(subset) * 1000
+                    baseline = baseline or elapsed
+                    print(
+                        f"    {name:12} {per_image:8.1f} ms/image"
+                        f"   {baseline / elapsed:5.1f}x"
+                    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
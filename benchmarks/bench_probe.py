@@ -0,0 +1,70 @@
+"""
+Dimension probing benchmark.
+
+Compares the header-only prober against the previous
+Image.open(path).size path on a synthetic set of images.
+
+    python -m benchmarks.bench_probe --count 2000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from benchmarks.dataset_gen import generate_dataset
+from core.image_probe import probe_dimensions
+
+
+# Every format / encoder variant the header parser handles
+FORMATS = "png,jpg,jpeg-progressive,webp,webp-lossless"
+
+
+def pil_size(path):
+    with Image.open(path) as img:
+        return img.size
+
+
+def time_probe(fn, paths, repeat):
+    best = None
+    results = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(p) for p in paths]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_dataset(folder, args.count, formats=FORMATS, resolutions="small")
+
+        pil_time, pil_sizes = time_probe(pil_size, paths, args.repeat)
+        fast_time, fast_sizes = time_probe(probe_dimensions, paths, args.repeat)
+
+    mismatches = sum(a != b for a, b in zip(pil_sizes, fast_sizes))
+
+    print(f"images:        {len(paths)}")
+    print(f"PIL open:      {len(paths) / pil_time:10.0f} records/s")
+    print(f"header probe:  {len(paths) / fast_time:10.0f} records/s")
+    print(f"speedup:       {pil_time / fast_time:10.1f}x")
+    print(f"mismatches:    {mismatches}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Cold-start benchmark: process start → first thumbnail painted.
+
+Runs main.py in a fresh process against a synthetic dataset (own
+settings.json in a temp folder, offscreen Qt unless --show) and reads
+the app's startup report.
+
+- cold: first launch, index and thumbnail stores are built
+- warm: later launches, served from the stores
+- --budget-ms fails (exit 1) when the warm median is over budget
+
+    python -m benchmarks.bench_startup --count 300 --runs 5 --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.dataset_gen import generate_dataset
+
+
+STARTUP_PREFIX = "STARTUP "
+
+
+def launch(workdir, show, timeout):
+    """
+    One app launch. Returns (wall_ms, report) with wall_ms measured
+    from just before the process is spawned until the report line.
+    """
+    env = dict(os.environ, DMP_STARTUP_REPORT="json")
+    if not show:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "main.py"), "--quit-after-startup"],
+        cwd=workdir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+    report = None
+    wall_ms = None
+    try:
+        for line in proc.stderr:
+            if line.startswith(STARTUP_PREFIX):
+                wall_ms = (time.perf_counter() - start) * 1000
+                report = json.loads(line[len(STARTUP_PREFIX):])
+                break
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        pass
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    if report is None:
+        raise RuntimeError("app exited without a startup report")
+
+    return wall_ms, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=5, help="warm launches")
+    parser.add_argument("--budget-ms", type=float, help="fail if warm median is slower")
+    parser.add_argument("--show", action="store_true", help="real window instead of offscreen")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        base = workdir / "datasets"
+        generate_dataset(
+            base / "bench", args.count, formats="jpg,png",
+            resolutions="400x400-1600x1600"
+        )
+
+        (workdir / "settings.json").write_text(json.dumps({
+            "dataset_base_path": str(base),
+            "metadata_backend": "sqlite",
+        }))
+
+        cold_ms, cold = launch(workdir, args.show, args.timeout)
+        warm = [launch(workdir, args.show, args.timeout) for _ in range(args.runs)]
+
+    warm_ms = [ms for ms, _ in warm]
+    median_ms = statistics.median(warm_ms)
+    last = warm[-1][1]
+
+    result = {
+        "images": args.count,
+        "cold_ms": round(cold_ms, 1),
+        "warm_ms": [round(ms, 1) for ms in warm_ms],
+        "warm_median_ms": round(median_ms, 1),
+        "milestones": last["milestones"],
+        "imports_ms": last["imports_ms"],
+        "slowest_imports": last["slowest_imports"][:10],
+        "budget_ms": args.budget_ms,
+        "over_budget": bool(args.budget_ms and median_ms > args.budget_ms),
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{args.count} images, process start → first thumbnail painted")
+        print(f"  cold        {cold_ms:8.1f} ms")
+        print(f"  warm median {median_ms:8.1f} ms  ({args.runs} runs)")
+        print("")
+        print("Warm milestones (ms since main.py started):")
+        for name, ms in last["milestones"].items():
+            print(f"  {ms:8.1f}  {name}")
+        print(f"  imports: {last['imports_ms']:.1f} ms in {last['modules']} modules")
+        print("")
+        print("Slowest imports (cumulative ms):")
+        for entry in last["slowest_imports"][:10]:
+            print(f"  {entry['cumulative_ms']:8.1f}  {entry['module']}")
+
+        if args.budget_ms:
+            verdict = "OVER" if result["over_budget"] else "within"
+            print(f"\n{verdict} budget of {args.budget_ms:.0f} ms")
+
+    return 1 if result["over_budget"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
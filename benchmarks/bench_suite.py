@@ -0,0 +1,386 @@
+"""
+Hot-path benchmark suite on a synthetic dataset tree.
+
+Times, on a generated tree (see benchmarks/dataset_gen.py):
+
+- scan:     scan_images, load_records (cold probe / warm index)
+- loader:   ImageLoaderWorker probe loop (cold / warm index)
+- metadata: MetadataManager set / get / clean, per ratings backend
+- gallery:  GalleryWidget.apply_filters, sort_rows, display_images
+            (Qt offscreen platform)
+
+Results go to JSON, with enough context (commit, versions, dataset
+parameters) to compare runs across changes:
+
+    python -m benchmarks.bench_suite --count 10000 --output after.json
+    python -m benchmarks.bench_suite --compare before.json after.json
+
+--data DIR keeps generated trees between runs (1M files take a while).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Before any Qt import
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.dataset_gen import add_dataset_arguments, dataset_params, ensure_dataset
+from core.dataset_index import DatasetIndex
+from core.image_loader import load_records, scan_images
+from core.image_metrics import METRICS
+from core.metadata_manager import BACKENDS, MetadataManager
+
+
+GROUPS = ("scan", "loader", "metadata", "gallery")
+
+SET_EACH_LIMIT = 20000      # set_rating() one by one on at most this many
+ORPHAN_SHARE = 0.1          # share of ratings made orphans for clean()
+
+FILTERS = {
+    "all": {},
+    "folders_half": {"selected_folders": "half"},
+    "rating_4_5": {"rating_filter": [4, 5]},
+    "size_small": {"size_range": (0, 1024)},
+    "combined": {
+        "selected_folders": "half",
+        "rating_filter": [3, 4, 5],
+        "size_range": (0, 2048),
+    },
+}
+
+SORT_MODES = (
+    None,
+    "Name A-Z",
+    "Name Z-A",
+    "Resolution High → Low",
+    "Sharpness High → Low",
+)
+
+
+# ---------------------------------------------------------
+# Results
+# ---------------------------------------------------------
+
+class Results:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.entries = []
+
+    def add(self, group, name, items, times):
+        best = min(times)
+        entry = {
+            "group": group,
+            "name": name,
+            "items": items,
+            "best_s": round(best, 6),
+            "median_s": round(statistics.median(times), 6),
+            "runs_s": [round(t, 6) for t in times],
+            "items_per_s": round(items / best) if best > 0 else None,
+        }
+        self.entries.append(entry)
+
+        print(
+            f"  {group:9} {name:34} {best * 1000:10.1f} ms"
+            f"  {entry['items_per_s'] or 0:>12,}/s",
+            file=sys.stderr
+        )
+
+    def measure(self, group, name, items, fn, setup=None):
+        """
+        Best / median of `repeat` runs of fn(setup()).
+        setup() runs outside the timed part.
+        """
+        times = []
+        for _ in range(self.repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            fn(state)
+            times.append(time.perf_counter() - start)
+
+        self.add(group, name, items, times)
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    import numpy
+    import PIL
+    import PySide6
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pillow": PIL.__version__,
+        "pyside6": PySide6.__version__,
+    }
+
+
+# ---------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------
+
+def bench_scan(results, root, work):
+    count = sum(1 for _ in scan_images(root))  # also warms the OS cache
+    results.measure("scan", "scan_images", count,
+                    lambda _: sum(1 for _ in scan_images(root)))
+
+    results.measure("scan", "load_records (probe all)", count,
+                    lambda _: sum(1 for _ in load_records(root)))
+
+    index = DatasetIndex(work / "scan-index.db")
+    sum(1 for _ in load_records(root, index))
+    results.measure("scan", "load_records (warm index)", count,
+                    lambda _: sum(1 for _ in load_records(root, index)))
+    index.close()
+
+
+def run_loader(worker):
+    loaded = []
+    worker.batch_loaded.connect(lambda batch: loaded.append(len(batch)))
+    worker.run()  # probe loop in this thread, signals are delivered directly
+    return sum(loaded)
+
+
+def bench_loader(results, root, work, count):
+    from core.loader_worker import ImageLoaderWorker
+
+    index_path = work / "loader-index.db"
+
+    def fresh_index():
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{index_path}{suffix}").unlink(missing_ok=True)
+        return ImageLoaderWorker(str(root), index_path)
+
+    results.measure("loader", "ImageLoaderWorker (cold index)", count,
+                    run_loader, setup=fresh_index)
+
+    results.measure("loader", "ImageLoaderWorker (warm index)", count,
+                    run_loader, setup=lambda: ImageLoaderWorker(str(root), index_path))
+
+
+def bench_metadata(results, relative, work):
+    rng = random.Random(0)
+    ratings = {p: rng.randint(1, 5) for p in relative}
+    each = relative[:SET_EACH_LIMIT]
+    valid = relative[int(len(relative) * ORPHAN_SHARE):]
+
+    for backend in BACKENDS:
+        times = {"set_ratings": [], "set_rating": [], "flush": [],
+                 "get_ratings": [], "clean_orphan_entries": []}
+
+        for run in range(results.repeat):
+            base = work / f"meta-{backend}-{run}"
+            manager = MetadataManager(base / "bench", base, backend)
+
+            def timed(name, fn):
+                start = time.perf_counter()
+                fn()
+                times[name].append(time.perf_counter() - start)
+
+            timed("set_ratings", lambda: manager.set_ratings(ratings))
+            timed("flush", manager.flush)
+            timed("set_rating", lambda: [manager.set_rating(p, 3) for p in each])
+            timed("get_ratings", lambda: manager.get_ratings(relative))
+            timed("clean_orphan_entries",
+                  lambda: (manager.clean_orphan_entries(valid), manager.flush()))
+
+            manager.close()
+            shutil.rmtree(base, ignore_errors=True)
+
+        for name, items in (
+            ("set_ratings", len(relative)), ("flush", len(relative)),
+            ("set_rating", len(each)), ("get_ratings", len(relative)),
+            ("clean_orphan_entries", len(relative)),
+        ):
+            results.add("metadata", f"{backend}: {name}", items, times[name])
+
+
+def bench_gallery(results, root, records):
+    from PySide6.QtWidgets import QApplication
+    from ui.gallery_widget import GalleryWidget
+
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(0)
+
+    gallery = GalleryWidget()
+    gallery.resize(1400, 900)
+    gallery.show()
+
+    for record in records:
+        record["rating"] = rng.randint(0, 5)
+
+    gallery.root_path = Path(root)
+    gallery.table.extend(records)
+    gallery.table.set_metrics({
+        r["path"]: tuple(rng.random() * 100 for _ in METRICS) for r in records
+    })
+    gallery.model.set_table(gallery.table)
+
+    folders = sorted(gallery.table.folder_ids)
+    count = len(records)
+
+    def configure(options):
+        gallery.selected_folders = None
+        gallery.rating_filter = None
+        gallery.size_range = None
+        for attr, value in options.items():
+            if value == "half":
+                value = folders[::2]
+            setattr(gallery, attr, value)
+
+    def settle():
+        app.processEvents()
+        gallery.thumb_pipeline.cancel_pending()  # no decoding in the timings
+
+    # Filters: from the unfiltered view to the filtered one (diff or reset)
+    for name, options in FILTERS.items():
+        def setup(options=options):
+            configure({})
+            gallery.display_images(gallery.filter_rows())
+            settle()
+            configure(options)
+
+        results.measure("gallery", f"apply_filters: {name}", count,
+                        lambda _: gallery.apply_filters(), setup=setup)
+        settle()
+
+    configure({})
+    rows = gallery.filter_rows()
+
+    for mode in SORT_MODES:
+        gallery.sort_mode = mode
+        results.measure("gallery", f"sort_rows: {mode or 'unsorted'}", count,
+                        lambda _: gallery.sort_rows(rows))
+    gallery.sort_mode = None
+
+    results.measure("gallery", "display_images", count,
+                    lambda _: gallery.display_images(rows), setup=settle)
+    results.measure("gallery", "display_images + layout/paint", count,
+                    lambda _: (gallery.display_images(rows), app.processEvents()),
+                    setup=settle)
+    settle()
+
+    gallery.shutdown()
+    gallery.close()
+
+
+# ---------------------------------------------------------
+# Compare
+# ---------------------------------------------------------
+
+def compare(before_path, after_path):
+    before = json.loads(Path(before_path).read_text())
+    after = json.loads(Path(after_path).read_text())
+    old = {(e["group"], e["name"]): e for e in before["results"]}
+
+    print(f"{'benchmark':46} {'before':>10} {'after':>10}   change")
+    for entry in after["results"]:
+        key = (entry["group"], entry["name"])
+        label = f"{entry['group']}: {entry['name']}"
+        if key not in old:
+            print(f"{label:46} {'-':>10} {entry['best_s'] * 1000:9.1f}ms")
+            continue
+
+        a, b = old[key]["best_s"], entry["best_s"]
+        change = (b / a - 1) * 100 if a else 0.0
+        print(f"{label:46} {a * 1000:8.1f}ms {b * 1000:8.1f}ms  {change:+7.1f}%")
+
+    return 0
+
+
+# ---------------------------------------------------------
+# Entry Point
+# ---------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_dataset_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=GROUPS, help="benchmark groups to run")
+    parser.add_argument("--data", help="keep generated datasets here (reused when parameters match)")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+
+    groups = args.only or GROUPS
+    params = dataset_params(args)
+    key = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:10]
+
+    temp = tempfile.TemporaryDirectory()
+    data = Path(args.data) if args.data else Path(temp.name)
+    work = Path(temp.name) / "work"
+    work.mkdir(parents=True, exist_ok=True)
+
+    try:
+        root = data / f"dataset-{key}"
+        print(f"dataset {root} ({args.count} files)...", file=sys.stderr)
+        ensure_dataset(root, params, lambda done, total: print(
+            f"  generated {done}/{total}", file=sys.stderr
+        ))
+
+        results = Results(args.repeat)
+        records = list(load_records(str(root)))
+        count = len(records)
+
+        if "scan" in groups:
+            bench_scan(results, str(root), work)
+        if "loader" in groups:
+            bench_loader(results, root, work, count)
+        if "metadata" in groups:
+            relative = [
+                str(Path(r["path"]).relative_to(root)).replace("\\", "/")
+                for r in records
+            ]
+            bench_metadata(results, relative, work)
+        if "gallery" in groups:
+            bench_gallery(results, str(root), records)
+
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": environment(),
+            "dataset": {**params, "files": count},
+            "repeat": args.repeat,
+            "results": results.entries,
+        }
+    finally:
+        temp.cleanup()
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
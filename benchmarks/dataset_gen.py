@@ -0,0 +1,263 @@
+"""
+Synthetic dataset trees for the benchmarks.
+
+    python -m benchmarks.dataset_gen /tmp/bench --count 100000 \\
+        --depth 3 --fanout 6 --formats jpg:3,png:1,webp:1 --resolutions mixed
+
+- depth / fanout: files are spread over a random folder tree, at
+  every level from the root down to `depth`
+- formats: weighted mix, e.g. "jpg:3,png:1"
+- resolutions: a preset name, "WxH" or a range "WxH-WxH"
+- content "flat": solid colors, encoded once per (format, size) and
+  copied, so 1M files take minutes, not hours (headers are real, so
+  probing and indexing behave like on real data). Disk use follows
+  the resolutions: ~8 KB/file for "small", ~30 KB/file for "mixed"
+- content "photo": gradient + noise per file, compresses like a
+  photo (decode benchmarks, small counts)
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from PIL import Image
+
+
+# name → (suffix, save options)
+FORMATS = {
+    "png": (".png", {"compress_level": 1}),
+    "jpg": (".jpg", {"quality": 90}),
+    "jpeg-progressive": (".jpeg", {"quality": 85, "progressive": True}),
+    "webp": (".webp", {"quality": 80}),
+    "webp-lossless": (".webp", {"lossless": True}),
+}
+
+# preset → [(weight, (min_w, min_h), (max_w, max_h))]
+RESOLUTIONS = {
+    "tiny": [(1, (64, 64), (256, 256))],
+    "small": [(1, (64, 64), (1024, 1024))],
+    "mixed": [
+        (5, (256, 256), (1024, 1024)),
+        (3, (1024, 768), (2048, 2048)),
+        (1, (3000, 2000), (6000, 4000)),
+    ],
+    "large": [(1, (4000, 3000), (6000, 4000))],
+}
+
+SIZE_POOL = 32      # distinct sizes (one template each) for "flat" content
+
+
+# ---------------------------------------------------------
+# Spec Parsing
+# ---------------------------------------------------------
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def parse_formats(spec):
+    """
+    "jpg:3,png:1" → {"jpg": 3.0, "png": 1.0} (weight defaults to 1)
+    """
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition(":")
+        if name not in FORMATS:
+            raise ValueError(f"unknown format {name!r} (choose from {', '.join(FORMATS)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def parse_resolutions(spec):
+    """
+    Preset name, "WxH" or "WxH-WxH" → list of weighted ranges.
+    """
+    if spec in RESOLUTIONS:
+        return RESOLUTIONS[spec]
+
+    low, _, high = spec.partition("-")
+    low = parse_size(low)
+    return [(1, low, parse_size(high) if high else low)]
+
+
+def sample_size(rng, buckets):
+    _, low, high = rng.choices(buckets, weights=[b[0] for b in buckets])[0]
+    return rng.randint(low[0], high[0]), rng.randint(low[1], high[1])
+
+
+# ---------------------------------------------------------
+# Content
+# ---------------------------------------------------------
+
+def encode(img, fmt):
+    suffix, options = FORMATS[fmt]
+    buffer = io.BytesIO()
+    img.save(buffer, format=Image.registered_extensions()[suffix], **options)
+    return buffer.getvalue()
+
+
+def photo_image(np_rng, size):
+    """
+    Smooth gradients plus noise: compresses like a photo, not like
+    a flat color.
+    """
+    width, height = size
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+
+    base = (x * np_rng.random() + y * np_rng.random()) % 256
+    noise = np_rng.integers(0, 24, (height, width, 3), dtype=np.uint8)
+    return Image.fromarray((base[..., None] + noise).astype(np.uint8), "RGB")
+
+
+class _FlatTemplates:
+    """
+    Encoded solid-color files, reused across the whole tree.
+    """
+
+    def __init__(self, rng, buckets):
+        self.rng = rng
+        self.sizes = [sample_size(rng, buckets) for _ in range(SIZE_POOL)]
+        self.cache = {}
+
+    def pick(self, fmt):
+        key = (fmt, self.rng.randrange(SIZE_POOL))
+
+        if key not in self.cache:
+            color = tuple(self.rng.randrange(256) for _ in range(3))
+            self.cache[key] = encode(Image.new("RGB", self.sizes[key[1]], color), fmt)
+
+        return self.cache[key]
+
+
+# ---------------------------------------------------------
+# Generator
+# ---------------------------------------------------------
+
+def folder_tree(rng, root, depth, fanout):
+    """
+    Random folder for one file: root or up to `depth` levels below.
+    """
+    folder = root
+    for level in range(rng.randint(0, depth)):
+        folder = folder / f"dir{level}_{rng.randrange(fanout):02d}"
+    return folder
+
+
+def generate_dataset(
+    root, count, depth=0, fanout=8, formats="png",
+    resolutions="small", content="flat", seed=0, progress=None
+):
+    """
+    Write `count` images under root, returns their paths (in
+    generation order). Same arguments + seed → same tree.
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+
+    mix = parse_formats(formats) if isinstance(formats, str) else dict(formats)
+    buckets = parse_resolutions(resolutions) if isinstance(resolutions, str) else resolutions
+    total = sum(mix.values())
+    assigned = dict.fromkeys(mix, 0)
+
+    templates = _FlatTemplates(rng, buckets) if content == "flat" else None
+    made = set()
+    paths = []
+
+    for i in range(count):
+        # Exact proportions (even for a handful of files), interleaved
+        fmt = max(mix, key=lambda n: mix[n] / total * (i + 1) - assigned[n])
+        assigned[fmt] += 1
+        folder = folder_tree(rng, root, depth, fanout)
+
+        if folder not in made:
+            folder.mkdir(parents=True, exist_ok=True)
+            made.add(folder)
+
+        path = folder / f"img_{i:07d}{FORMATS[fmt][0]}"
+
+        if templates:
+            path.write_bytes(templates.pick(fmt))
+        else:
+            img = photo_image(np_rng, sample_size(rng, buckets))
+            img.save(path, **FORMATS[fmt][1])
+
+        paths.append(path)
+
+        if progress and (i + 1) % 10000 == 0:
+            progress(i + 1, count)
+
+    return paths
+
+
+def ensure_dataset(root, params, progress=None):
+    """
+    generate_dataset(root, **params) unless root was already generated
+    with the same parameters (big trees are reused between runs).
+    Returns the number of files.
+    """
+    root = Path(root)
+    manifest = root.parent / f"{root.name}.manifest.json"
+
+    if root.is_dir() and manifest.exists():
+        saved = json.loads(manifest.read_text())
+        if saved.get("params") == params:
+            return saved["files"]
+
+    if root.exists():
+        raise FileExistsError(f"{root} exists but was not generated with these parameters")
+
+    paths = generate_dataset(root, progress=progress, **params)
+    manifest.write_text(json.dumps({"params": params, "files": len(paths)}, indent=2))
+    return len(paths)
+
+
+def add_dataset_arguments(parser, count=1000):
+    """
+    Shared command-line options for benchmarks that generate a tree.
+    """
+    parser.add_argument("--count", type=int, default=count)
+    parser.add_argument("--depth", type=int, default=2, help="folder levels below the root")
+    parser.add_argument("--fanout", type=int, default=8, help="subfolders per level")
+    parser.add_argument("--formats", default="jpg:3,png:1,webp:1", help="weighted mix, e.g. jpg:3,png:1")
+    parser.add_argument("--resolutions", default="mixed", help=f"{', '.join(RESOLUTIONS)}, WxH or WxH-WxH")
+    parser.add_argument("--content", choices=("flat", "photo"), default="flat")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def dataset_params(args):
+    return {
+        "count": args.count,
+        "depth": args.depth,
+        "fanout": args.fanout,
+        "formats": args.formats,
+        "resolutions": args.resolutions,
+        "content": args.content,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", help="folder to create")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    def progress(done, total):
+        print(f"  {done}/{total}", file=sys.stderr)
+
+    files = ensure_dataset(args.root, dataset_params(args), progress)
+    print(f"{files} images under {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""
+Headless dataset tools (no Qt, no display needed).
+
+    python cli.py scan  <folder>
+    python cli.py stats <folder> [--json]
+    python cli.py query <folder> [--rating 0 1] [--max-side 512] ...
+    python cli.py clean <folder> [--dry-run]
+
+Uses the same index, ratings and metric stores as the GUI. The
+dataset base and ratings backend default to settings.json.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from core.batch_pool import map_cached
+from core.dataset_index import DatasetIndex
+from core.hash_store import HashStore
+from core.image_loader import load_records
+from core.image_metrics import METRICS
+from core.image_table import ImageTable
+from core.metadata_manager import BACKENDS, MetadataManager
+from core.metrics_store import MetricsStore
+from core.settings_manager import SettingsManager
+from core.thumbnail_store import ThumbnailStore
+
+
+# Same buckets as the gallery's size dropdown (longest side)
+SIZE_PRESETS = {
+    "small": (0, 512),
+    "medium": (512, 1024),
+    "large": (1024, 99999),
+}
+
+SORT_KEYS = ("path", "name", "resolution", "rating", *METRICS)
+
+
+# ---------------------------------------------------------
+# Dataset Loading
+# ---------------------------------------------------------
+
+class Dataset:
+    """
+    One dataset folder loaded the way the gallery loads it:
+    index-backed scan, ratings joined, stored metrics attached.
+    """
+
+    def __init__(self, folder, base=None, backend=None):
+        settings = SettingsManager()
+
+        self.root = Path(os.path.abspath(folder))
+        self.metadata = MetadataManager(
+            self.root,
+            base if base is not None else settings.get_dataset_base_path(),
+            backend or settings.get_metadata_backend()
+        )
+        self.table = ImageTable()
+
+    def relative_path(self, path):
+        return str(Path(path).relative_to(self.root)).replace("\\", "/")
+
+    def scan(self):
+        index = DatasetIndex(self.metadata.resolve_store_file("index.db"))
+        try:
+            records = list(load_records(str(self.root), index))
+        finally:
+            index.close()
+
+        relative = [self.relative_path(r["path"]) for r in records]
+        ratings = self.metadata.get_ratings(relative)
+        for record, relative_path in zip(records, relative):
+            record["rating"] = ratings[relative_path]
+
+        self.table.extend(records)
+        return self
+
+    def load_metrics(self):
+        store = MetricsStore(self.metadata.resolve_store_file("metrics.db"))
+        try:
+            self.table.set_metrics(
+                map_cached(None, self.live_paths(), store, str(self.root))
+            )
+        finally:
+            store.close()
+
+    def live_paths(self):
+        return [self.table.paths[row] for row in self.table.live_rows()]
+
+    def close(self):
+        self.metadata.close()
+
+
+def record_out(dataset, row):
+    record = dataset.table.record(row)
+    record["relative_path"] = dataset.relative_path(record["path"])
+
+    for name in METRICS:
+        value = float(getattr(dataset.table, name)[row])
+        if not math.isnan(value):  # not measured yet
+            record[name] = round(value, 3)
+
+    return record
+
+
+def emit(args, data, text_lines):
+    if args.json:
+        json.dump(data, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        for line in text_lines:
+            print(line)
+
+
+# ---------------------------------------------------------
+# Commands
+# ---------------------------------------------------------
+
+def cmd_scan(args, dataset):
+    start = time.perf_counter()
+    dataset.scan()
+    elapsed = time.perf_counter() - start
+
+    data = {
+        "folder": str(dataset.root),
+        "images": len(dataset.table.live_rows()),
+        "seconds": round(elapsed, 3),
+    }
+    emit(args, data, [
+        f"{data['images']} images in {data['folder']} ({elapsed:.2f}s)"
+    ])
+
+
+def cmd_stats(args, dataset):
+    dataset.scan()
+    table = dataset.table
+    rows = table.live_rows()
+
+    ratings = Counter(int(r) for r in table.rating[rows])
+    folders = Counter(dataset.relative_path(table.folder(r)) for r in rows)
+
+    sizes = {}
+    for name, size_range in SIZE_PRESETS.items():
+        sizes[name] = len(table.select(rows, size_range=size_range))
+
+    data = {
+        "folder": str(dataset.root),
+        "images": len(rows),
+        "ratings": {str(r): ratings[r] for r in range(6)},
+        "sizes": sizes,
+        "folders": dict(sorted(folders.items())),
+    }
+
+    lines = [f"Images: {len(rows)}", "", "Ratings:"]
+    lines += [
+        f"  {'Unrated' if r == 0 else f'{r}★':8} {ratings[r]}" for r in range(6)
+    ]
+    lines += ["", "Sizes (longest side):"]
+    lines += [f"  {name:8} {count}" for name, count in sizes.items()]
+    lines += ["", "Folders:"]
+    lines += [f"  {folder:30} {count}" for folder, count in data["folders"].items()]
+
+    emit(args, data, lines)
+
+
+def cmd_query(args, dataset):
+    dataset.scan()
+    table = dataset.table
+
+    metric_ranges = {}
+    for spec in args.metric or []:
+        name, _, bounds = spec.partition(":")
+        low, _, high = bounds.partition(":")
+        if name not in METRICS:
+            raise SystemExit(f"unknown metric {name!r} (choose from {', '.join(METRICS)})")
+        metric_ranges[name] = (
+            float(low) if low else None,
+            float(high) if high else None,
+        )
+
+    if metric_ranges or args.sort in METRICS:
+        dataset.load_metrics()
+
+    folders = None
+    if args.subfolders:
+        folders = [str(dataset.root / f) for f in args.subfolders]
+
+    size_range = SIZE_PRESETS.get(args.size)
+    if args.max_side is not None:
+        size_range = (0, args.max_side)
+
+    min_size = None
+    if args.min_width or args.min_height:
+        min_size = (args.min_width or 0, args.min_height or 0)
+
+    rows = table.select(
+        folders=folders,
+        size_range=size_range,
+        min_size=min_size,
+        ratings=args.rating,
+        metric_ranges=metric_ranges
+    )
+
+    if args.sort in ("path", "name"):
+        key = table.name if args.sort == "name" else table.paths.__getitem__
+        rows = sorted(rows, key=key, reverse=args.reverse)
+    elif args.sort:
+        column = getattr(table, args.sort)
+        rows = sorted(rows, key=lambda r: float(column[r]), reverse=args.reverse)
+        # Unmeasured metrics (NaN) always go last
+        rows.sort(key=lambda r: math.isnan(column[r]))
+
+    if args.limit is not None:
+        rows = rows[:args.limit]
+
+    records = [record_out(dataset, row) for row in rows]
+    emit(args, records, [r["path"] for r in records])
+
+
+def cmd_clean(args, dataset):
+    dataset.scan()
+    live = set(dataset.live_paths())
+    valid_relative = {dataset.relative_path(p) for p in live}
+    root = str(dataset.root)
+    metadata = dataset.metadata
+
+    orphan_ratings = sorted(set(metadata.all_ratings()) - valid_relative)
+
+    stores = {
+        "hashes": HashStore(metadata.resolve_store_file("hashes.db")),
+        "metrics": MetricsStore(metadata.resolve_store_file("metrics.db")),
+    }
+    orphan_entries = {
+        name: sorted(set(store.load(root)) - live)
+        for name, store in stores.items()
+    }
+
+    if not args.dry_run:
+        metadata.clean_orphan_entries(valid_relative)
+
+        for name, store in stores.items():
+            store.remove(orphan_entries[name])
+
+        thumbs = ThumbnailStore(metadata.resolve_store_file("thumbnails.db"), 0)
+        thumbs.prune(root, live)
+        thumbs.close()
+
+    for store in stores.values():
+        store.close()
+
+    data = {
+        "folder": root,
+        "dry_run": args.dry_run,
+        "orphan_ratings": orphan_ratings,
+        **{f"orphan_{name}": paths for name, paths in orphan_entries.items()},
+    }
+
+    verb = "Would remove" if args.dry_run else "Removed"
+    lines = [f"{verb} {len(orphan_ratings)} orphan rating entries"]
+    lines += [f"  {p}" for p in orphan_ratings]
+    lines += [
+        f"{verb} {len(paths)} orphan {name} entries"
+        for name, paths in orphan_entries.items()
+    ]
+    emit(args, data, lines)
+
+
+# ---------------------------------------------------------
+# Entry Point
+# ---------------------------------------------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Headless dataset tools (scan, stats, query, clean)."
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("folder", help="dataset folder")
+    common.add_argument("--base", help="dataset base path (default: settings.json)")
+    common.add_argument("--backend", choices=BACKENDS, help="ratings backend (default: settings.json)")
+    common.add_argument("--json", action="store_true", help="machine-readable output")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "scan", parents=[common], help="scan the folder and refresh the index"
+    ).set_defaults(func=cmd_scan)
+
+    commands.add_parser(
+        "stats", parents=[common], help="counts per rating, size and folder"
+    ).set_defaults(func=cmd_stats)
+
+    query = commands.add_parser("query", parents=[common], help="list matching images")
+    query.add_argument("--rating", type=int, nargs="+", help="accepted ratings (0 = unrated)")
+    query.add_argument("--size", choices=SIZE_PRESETS, help="size bucket of the longest side")
+    query.add_argument("--max-side", type=int, help="longest side at most this (low-res files)")
+    query.add_argument("--min-width", type=int)
+    query.add_argument("--min-height", type=int)
+    query.add_argument(
+        "--folder", nargs="+", dest="subfolders",
+        help="subfolders relative to the dataset ('.' = root)"
+    )
+    query.add_argument(
+        "--metric", action="append", metavar="NAME:MIN:MAX",
+        help="range on a stored quality metric, e.g. sharpness::50"
+    )
+    query.add_argument("--sort", choices=SORT_KEYS)
+    query.add_argument("--reverse", action="store_true")
+    query.add_argument("--limit", type=int)
+    query.set_defaults(func=cmd_query)
+
+    clean = commands.add_parser(
+        "clean", parents=[common],
+        help="drop ratings, thumbnails, hashes and metrics of missing files"
+    )
+    clean.add_argument("--dry-run", action="store_true", help="only report")
+    clean.set_defaults(func=cmd_clean)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not Path(args.folder).is_dir():
+        print(f"not a folder: {args.folder}", file=sys.stderr)
+        return 2
+
+    dataset = Dataset(args.folder, args.base, args.backend)
+    try:
+        args.func(args, dataset)
+    finally:
+        dataset.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
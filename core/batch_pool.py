@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from core.thumbnail_store import ThumbnailStore
+
+
+TASK_CHUNK = 32         # paths per task sent to a worker process
+STORE_FLUSH_SIZE = 500  # new results written to the store per transaction
+
+
+def _apply_many(fn, paths):
+    return [fn(p) for p in paths]
+
+
+def map_cached(fn, paths, store=None, root=None, max_workers=None,
+               progress=None, cancelled=None, on_results=None):
+    """
+    {path: fn(path)} for every path where fn returned a tuple.
+
+    - fn must be a picklable module-level function returning a tuple
+      of values (or None for unreadable files); fn=None only returns
+      what the store already has
+    - store (HashStore / MetricsStore): results are reused while
+      size + mtime match, new ones are written back in chunks, so an
+      interrupted run resumes where it stopped
+    - The rest runs in a process pool
+    - progress(done, total) is called as results come in
+    - on_results({path: values}) gets cached results first, then
+      every chunk that was written to the store
+    - cancelled() is polled between results; returns None if it fires
+    """
+    known = store.load(root) if store and root else {}
+    results = {}
+    todo = []
+
+    for path in paths:
+        key = ThumbnailStore.stat_key(path)
+        if key is None:
+            continue
+
+        cached = known.get(path)
+        if cached and cached[:2] == key:
+            results[path] = cached[2:]
+        else:
+            todo.append((path, key))
+
+    total = len(paths)
+    done = total - len(todo)
+    if progress:
+        progress(done, total)
+    if on_results and results:
+        on_results(dict(results))
+
+    if not todo or fn is None:
+        return results
+
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) - 1)
+
+    chunks = [
+        todo[i:i + TASK_CHUNK] for i in range(0, len(todo), TASK_CHUNK)
+    ]
+    pending = {}
+    pending_rows = []
+
+    def flush():
+        if store:
+            store.upsert(pending_rows)
+        if on_results:
+            on_results(dict(pending))
+        pending.clear()
+        pending_rows.clear()
+
+    # spawn: forking a process that runs Qt threads is not safe
+    executor = ProcessPoolExecutor(
+        max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        tasks = executor.map(
+            _apply_many,
+            [fn] * len(chunks),
+            [[path for path, _ in chunk] for chunk in chunks]
+        )
+
+        for chunk, chunk_results in zip(chunks, tasks):
+            if cancelled and cancelled():
+                return None
+
+            for (path, (size, mtime_ns)), values in zip(chunk, chunk_results):
+                if values is None:
+                    continue
+                results[path] = pending[path] = values
+                pending_rows.append((path, size, mtime_ns, *values))
+
+            if len(pending_rows) >= STORE_FLUSH_SIZE:
+                flush()
+
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if pending_rows:
+            flush()
+
+    return results
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+
+
+class ByteLRU:
+    """
+    Least-recently-used cache bounded by total size in bytes.
+
+    - put() takes the entry's cost in bytes
+    - Oldest entries are evicted until the total fits max_bytes
+    - An entry larger than the whole budget is not stored
+    - keep(key) (optional) marks entries to skip while evicting, e.g.
+      what is on screen; if only kept entries remain the budget is
+      exceeded rather than throwing away what is being shown
+    """
+
+    def __init__(self, max_bytes, keep=None):
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # key → (value, cost)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, cost):
+        self.discard(key)
+
+        if cost > self.max_bytes:
+            return
+
+        self._entries[key] = (value, cost)
+        self.total_bytes += cost
+        self.evict()
+
+    def discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def rename(self, old_key, new_key):
+        """
+        Move an entry to a new key (counts as a use).
+        """
+        entry = self._entries.pop(old_key, None)
+        if entry is None:
+            return
+
+        self.discard(new_key)
+        self._entries[new_key] = entry
+
+    def evict(self):
+        kept = []
+
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            if self.keep and self.keep(key):
+                kept.append((key, entry))
+                continue
+            self.total_bytes -= entry[1]
+
+        # Kept entries go back to the old end, in their original order
+        for key, entry in reversed(kept):
+            self._entries[key] = entry
+            self._entries.move_to_end(key, last=False)
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,13 @@
+from core.path_store import PathStore
+
+
+class DatasetIndex(PathStore):
+    """
+    Persistent per-dataset image index.
+
+    - Stores path, size, mtime and probed dimensions
+    - Lets a reload skip probing files that did not change
+    """
+
+    TABLE = "images"
+    COLUMNS = (("width", "INTEGER"), ("height", "INTEGER"))
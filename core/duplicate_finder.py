@@ -0,0 +1,146 @@
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+
+from core.batch_pool import map_cached
+from core.image_hash import HASH_BITS, hash_image
+
+
+MAX_DISTANCE = 6  # pHash bits that may differ for a near-duplicate
+
+
+# ---------------------------------------------------------
+# Hashing (process pool)
+# ---------------------------------------------------------
+
+def compute_hashes(paths, store=None, root=None, max_workers=None,
+                   progress=None, cancelled=None):
+    """
+    {path: (dhash, phash)} for every readable path, see map_cached.
+    """
+    return map_cached(
+        hash_image, paths, store, root, max_workers,
+        progress=progress, cancelled=cancelled
+    )
+
+
+# ---------------------------------------------------------
+# Grouping (multi-index hashing)
+# ---------------------------------------------------------
+
+def _flip_masks(bits, radius):
+    """
+    Every bits-wide mask with at most radius bits set.
+    """
+    masks = [0]
+    for r in range(1, radius + 1):
+        for positions in combinations(range(bits), r):
+            mask = 0
+            for p in positions:
+                mask |= 1 << p
+            masks.append(mask)
+    return masks
+
+
+def _popcount(values):
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(values)
+    return _POPCOUNT8[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def near_pairs(hashes, max_distance=MAX_DISTANCE, bands=4):
+    """
+    Index pairs (i, j), i < j, with hamming(hashes[i], hashes[j])
+    <= max_distance, as two arrays. hashes must be distinct.
+
+    Multi-index hashing: the 64 bits are split into bands. Two hashes
+    within max_distance have at least one band that differs in at most
+    max_distance // bands bits (pigeonhole), so each hash only probes
+    the band buckets within that small radius - no all-pairs pass.
+    Each probe is one vectorized searchsorted over the whole set.
+    """
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    count = len(values)
+
+    band_bits = HASH_BITS // bands
+    band_mask = np.uint64((1 << band_bits) - 1)
+    radius = max_distance // bands
+    masks = _flip_masks(band_bits, radius)
+
+    found_i, found_j = [], []
+
+    for b in range(bands):
+        band = (values >> np.uint64(b * band_bits)) & band_mask
+        order = np.argsort(band, kind="stable")
+        sorted_band = band[order]
+
+        for mask in masks:
+            probe = band ^ np.uint64(mask)
+            left = np.searchsorted(sorted_band, probe, "left")
+            right = np.searchsorted(sorted_band, probe, "right")
+            sizes = right - left
+
+            total = int(sizes.sum())
+            if total == 0:
+                continue
+
+            # Expand every (i, bucket) into its candidate pairs
+            i = np.repeat(np.arange(count), sizes)
+            starts = np.repeat(left - (np.cumsum(sizes) - sizes), sizes)
+            j = order[np.arange(total) + starts]
+
+            keep = j > i
+            i, j = i[keep], j[keep]
+            keep = _popcount(values[i] ^ values[j]) <= max_distance
+
+            found_i.append(i[keep])
+            found_j.append(j[keep])
+
+    if not found_i:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # A pair can be found through several bands
+    pairs = np.unique(
+        np.stack((np.concatenate(found_i), np.concatenate(found_j)), axis=1),
+        axis=0
+    )
+    return pairs[:, 0], pairs[:, 1]
+
+
+def near_duplicate_groups(hashes, max_distance=MAX_DISTANCE):
+    """
+    hashes: {path: hash}. Returns groups (sorted path lists, 2+ paths)
+    of images connected by near-duplicate links.
+    """
+    # Identical hashes first: one index entry per distinct hash
+    by_hash = defaultdict(list)
+    for path, h in hashes.items():
+        by_hash[h].append(path)
+
+    distinct = list(by_hash)
+    parent = list(range(len(distinct)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(*near_pairs(distinct, max_distance)):
+        i, j = int(i), int(j)
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    groups = defaultdict(list)
+    for i, h in enumerate(distinct):
+        groups[find(i)].extend(by_hash[h])
+
+    return sorted(
+        (sorted(paths) for paths in groups.values() if len(paths) > 1),
+        key=lambda paths: paths[0]
+    )
@@ -0,0 +1,39 @@
+from PySide6.QtCore import QThread, Signal
+from core.duplicate_finder import (
+    MAX_DISTANCE, compute_hashes, near_duplicate_groups
+)
+from core.hash_store import HashStore
+
+
+class DuplicateWorker(QThread):
+    """
+    Hashes the given images (process pool, cached in the hash store)
+    and reports near-duplicate groups.
+    """
+
+    progress = Signal(int, int)     # done, total
+    groups_found = Signal(list)     # [[path, ...], ...]
+
+    def __init__(self, paths, root, store_path=None, max_distance=MAX_DISTANCE):
+        super().__init__()
+        self.paths = paths
+        self.root = root
+        self.store_path = store_path
+        self.max_distance = max_distance
+
+    def run(self):
+        with HashStore.open_in_thread(self.store_path) as store:
+            hashes = compute_hashes(
+                self.paths, store, self.root,
+                progress=self.progress.emit,
+                cancelled=self.isInterruptionRequested
+            )
+
+        if hashes is None:
+            return  # interrupted
+
+        phashes = {path: h[1] for path, h in hashes.items()}
+        groups = near_duplicate_groups(phashes, self.max_distance)
+
+        if not self.isInterruptionRequested():
+            self.groups_found.emit(groups)
@@ -0,0 +1,194 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+COPY_WORKERS = 4    # parallel copies when moving across devices
+PROGRESS_STEP = 32  # files between progress reports (queued signals)
+
+
+# ---------------------------------------------------------
+# Planning
+# ---------------------------------------------------------
+
+def free_destination(folder, name, taken):
+    """
+    folder/name, or folder/"stem (n).ext" when that name is on disk
+    already or was handed out earlier in the same batch (taken).
+    """
+    stem, ext = os.path.splitext(name)
+    candidate = os.path.join(folder, name)
+    n = 1
+
+    while os.path.normcase(candidate) in taken or os.path.lexists(candidate):
+        candidate = os.path.join(folder, f"{stem} ({n}){ext}")
+        n += 1
+
+    taken.add(os.path.normcase(candidate))
+    return candidate
+
+
+def plan_moves(paths, dest_folder):
+    """
+    [(source, destination)] for moving paths into dest_folder.
+    Files already in dest_folder are left out, name collisions get
+    a " (n)" suffix.
+    """
+    dest_folder = os.path.normpath(dest_folder)
+    taken = set()
+    pairs = []
+
+    for path in paths:
+        path = os.path.normpath(path)
+        if os.path.normcase(os.path.dirname(path)) == os.path.normcase(dest_folder):
+            continue
+        pairs.append(
+            (path, free_destination(dest_folder, os.path.basename(path), taken))
+        )
+
+    return pairs
+
+
+def same_device(path, folder):
+    try:
+        return os.stat(path).st_dev == os.stat(folder).st_dev
+    except OSError:
+        return False
+
+
+# ---------------------------------------------------------
+# Moving
+# ---------------------------------------------------------
+
+def rename_file(src, dst):
+    # os.rename silently replaces on POSIX: never overwrite
+    if os.path.lexists(dst):
+        raise FileExistsError(f"{dst} already exists")
+    os.rename(src, dst)
+
+
+def copy_then_delete(src, dst):
+    """
+    Cross-device move. A failed copy leaves no partial file behind,
+    a source that cannot be removed undoes the copy (no duplicates).
+    """
+    if os.path.lexists(dst):
+        raise FileExistsError(f"{dst} already exists")
+
+    try:
+        shutil.copy2(src, dst)  # keeps mtime → index / thumbnails stay valid
+        os.remove(src)
+    except BaseException:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        raise
+
+
+def move_files(pairs, progress=None, cancelled=None, max_workers=COPY_WORKERS):
+    """
+    Move every (source, destination) pair.
+
+    - Same device: one rename each (metadata only, instant)
+    - Otherwise: copy-then-delete on a small thread pool
+    - progress(done, total) every PROGRESS_STEP files and at the end
+    - cancelled() is polled between files; what is not moved yet
+      stays where it is
+
+    Returns (moved [(source, destination)], failed [(source, error)]).
+    """
+    renames = []
+    copies = []
+    for src, dst in pairs:
+        if same_device(src, os.path.dirname(dst)):
+            renames.append((src, dst))
+        else:
+            copies.append((src, dst))
+
+    moved = []
+    failed = []
+    total = len(pairs)
+    done = 0
+
+    for src, dst in renames:
+        if cancelled and cancelled():
+            return moved, failed
+
+        try:
+            rename_file(src, dst)
+            moved.append((src, dst))
+        except OSError as e:
+            failed.append((src, str(e)))
+
+        done += 1
+        if progress and (done % PROGRESS_STEP == 0 or done == total):
+            progress(done, total)
+
+    if not copies:
+        return moved, failed
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        futures = {
+            pool.submit(copy_then_delete, src, dst): (src, dst)
+            for src, dst in copies
+        }
+        stopping = False
+
+        for future in as_completed(futures):
+            if not stopping and cancelled and cancelled():
+                stopping = True
+                for pending in futures:
+                    pending.cancel()  # running copies still finish
+
+            if future.cancelled():
+                continue
+
+            src, dst = futures[future]
+            error = future.exception()
+            if error is None:
+                moved.append((src, dst))
+            else:
+                failed.append((src, str(error)))
+
+            done += 1
+            if progress and (done % PROGRESS_STEP == 0 or done == total):
+                progress(done, total)
+
+    return moved, failed
+
+
+# ---------------------------------------------------------
+# Deleting
+# ---------------------------------------------------------
+
+def trash_files(paths, progress=None, cancelled=None):
+    """
+    Send every path to the recycle bin / trash, one by one so a
+    single failure does not fail the batch.
+
+    - progress(done, total) every PROGRESS_STEP files and at the end
+    - cancelled() is polled between files
+
+    Returns (deleted [path], failed [(path, error)]).
+    """
+    from send2trash import send2trash  # first use only, keeps startup lean
+
+    deleted = []
+    failed = []
+    total = len(paths)
+
+    for done, path in enumerate(paths, 1):
+        if cancelled and cancelled():
+            break
+
+        try:
+            send2trash(path)
+            deleted.append(path)
+        except Exception as e:  # send2trash raises OSError and its own errors
+            failed.append((path, str(e)))
+
+        if progress and (done % PROGRESS_STEP == 0 or done == total):
+            progress(done, total)
+
+    return deleted, failed
@@ -0,0 +1,31 @@
+from PySide6.QtCore import QThread, Signal
+
+
+class FileWorker(QThread):
+    """
+    Runs one file operation (move, delete) in the background.
+
+    - operation(progress, cancelled) does the work and returns
+      (done, failed [(path, error)]), see core/file_mover.py
+    - Cancelling stops between files; files already handled stay
+      handled and are reported like a normal finish
+    - The result is also kept on the worker (done / failed), so it
+      can be applied after wait() without the queued signal
+    """
+
+    progress = Signal(int, int)             # done, total
+    finished_files = Signal(list, list)     # done, [(path, error)]
+
+    def __init__(self, name, operation):
+        super().__init__()
+        self.name = name
+        self.operation = operation
+        self.done = []
+        self.failed = []
+        self.applied = False    # set by the gallery once handled
+
+    def run(self):
+        self.done, self.failed = self.operation(
+            self.progress.emit, self.isInterruptionRequested
+        )
+        self.finished_files.emit(self.done, self.failed)
@@ -0,0 +1,143 @@
+import os
+import threading
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+
+def walk_directories(root):
+    """
+    root and every directory below it (scandir, no per-entry stat).
+    """
+    directories = []
+    stack = [root]
+
+    while stack:
+        directory = stack.pop()
+        directories.append(directory)
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            stack.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    return directories
+
+
+class FolderWatcher(QObject):
+    """
+    Recursive directory watcher on top of QFileSystemWatcher.
+
+    - Directory trees are collected in a background thread
+    - Change notifications are debounced and delivered as one
+      list of normalized directory paths
+    - hold() / release(): notifications are collected but only
+      delivered after the last release (the app's own bulk
+      operations apply their changes themselves first)
+    """
+
+    directories_changed = Signal(list)
+    _collected = Signal(int, list)
+
+    DEBOUNCE_MS = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._pending = set()
+        self._generation = 0
+        self._holds = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._flush)
+
+        self._collected.connect(self._add_paths)
+
+    # ---------------------------------------------------------
+    # Watch Management
+    # ---------------------------------------------------------
+
+    def watch_tree(self, root):
+        """
+        Replace everything currently watched with root's tree.
+        """
+        self.clear()
+        self.add_tree(root)
+
+    def add_tree(self, root):
+        generation = self._generation
+
+        threading.Thread(
+            target=lambda: self._collected.emit(
+                generation, walk_directories(os.path.normpath(root))
+            ),
+            daemon=True
+        ).start()
+
+    def remove_tree(self, root):
+        root = os.path.normpath(root)
+        prefix = root + os.sep
+
+        paths = [
+            d for d in self.watcher.directories()
+            if os.path.normpath(d) == root
+            or os.path.normpath(d).startswith(prefix)
+        ]
+        if paths:
+            self.watcher.removePaths(paths)
+
+    def directories(self):
+        return {os.path.normpath(d) for d in self.watcher.directories()}
+
+    def clear(self):
+        self._generation += 1
+        self._holds = 0
+        self._pending.clear()
+        self._timer.stop()
+
+        watched = self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+
+    def _add_paths(self, generation, directories):
+        if generation != self._generation:
+            return  # tree of a previous dataset
+
+        known = self.directories()
+        new = [d for d in directories if d not in known]
+        if new:
+            self.watcher.addPaths(new)
+
+    # ---------------------------------------------------------
+    # Change Notifications
+    # ---------------------------------------------------------
+
+    def _on_directory_changed(self, path):
+        self._pending.add(os.path.normpath(path))
+        self._timer.start()
+
+    def hold(self):
+        self._holds += 1
+
+    def release(self):
+        self._holds = max(0, self._holds - 1)
+        if not self._holds and self._pending:
+            self._timer.start()
+
+    def _flush(self):
+        if self._holds:
+            return  # delivered on release()
+
+        changed = sorted(self._pending)
+        self._pending.clear()
+
+        if changed:
+            self.directories_changed.emit(changed)
@@ -0,0 +1,38 @@
+from core.path_store import PathStore
+
+
+_SIGN = 1 << 63
+_WRAP = 1 << 64
+
+
+def _to_sql(value):
+    # SQLite integers are signed 64-bit
+    return value - _WRAP if value >= _SIGN else value
+
+
+def _from_sql(value):
+    return value % _WRAP
+
+
+class HashStore(PathStore):
+    """
+    Persistent perceptual hashes for one dataset.
+
+    - Entries are (path, size, mtime_ns, dhash, phash)
+    - Lets a second duplicate search skip every unchanged file
+    """
+
+    TABLE = "hashes"
+    COLUMNS = (("dhash", "INTEGER"), ("phash", "INTEGER"))
+
+    def to_sql(self, rows):
+        return (
+            (path, size, mtime_ns, _to_sql(dhash), _to_sql(phash))
+            for path, size, mtime_ns, dhash, phash in rows
+        )
+
+    def from_sql(self, rows):
+        return (
+            (path, size, mtime_ns, _from_sql(dhash), _from_sql(phash))
+            for path, size, mtime_ns, dhash, phash in rows
+        )
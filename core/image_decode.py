@@ -0,0 +1,65 @@
+# Keep at least this many times the target size before the final
+# resample, so the downscale stays sharp (same meaning as PIL's own
+# reducing_gap)
+REDUCING_GAP = 2.0
+
+
+def decode_reduced(path, max_width, max_height=None):
+    """
+    Decode path to fit inside max_width × max_height, doing as little
+    full-resolution work as the format allows.
+
+    - JPEG: draft() to the fitted target size, so libjpeg decodes at
+      the smallest 1/2, 1/4 or 1/8 scale that still covers it.
+      thumbnail() on its own drafts to REDUCING_GAP × the box and
+      often decodes one scale step larger (4× the pixels)
+    - Other formats: decoded once, then reduce() (integer box filter)
+      brings it close to the target before the final resample
+
+    Returns a loaded PIL image (RGB / RGBA / L / P).
+    Raises like Image.open on unreadable files.
+    """
+    from PIL import Image  # lazy: warm starts are served by the store
+
+    if max_height is None:
+        max_height = max_width
+
+    with Image.open(path) as img:
+        ratio = min(max_width / img.width, max_height / img.height)
+        if ratio < 1:
+            img.draft(None, (
+                max(1, int(img.width * ratio)), max(1, int(img.height * ratio))
+            ))
+
+        # Remaining resample; a second draft() inside is a no-op
+        img.thumbnail((max_width, max_height), reducing_gap=REDUCING_GAP)
+        img.load()
+
+    if img.mode not in ("1", "L", "P", "RGB", "RGBA"):
+        img = img.convert("RGBA")
+
+    return img
+
+
+def read_scaled_qimage(path, max_width, max_height=None):
+    """
+    Qt-side reduced decode: QImageReader.setScaledSize lets the
+    JPEG plugin use libjpeg DCT scaling, other formats are scaled
+    by the reader. Returns a null QImage on failure.
+    """
+    from PySide6.QtCore import QSize, Qt
+    from PySide6.QtGui import QImageReader
+
+    if max_height is None:
+        max_height = max_width
+
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+
+    size = reader.size()
+    if size.isValid() and (size.width() > max_width or size.height() > max_height):
+        reader.setScaledSize(
+            size.scaled(QSize(max_width, max_height), Qt.KeepAspectRatio)
+        )
+
+    return reader.read()
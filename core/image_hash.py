@@ -0,0 +1,77 @@
+import numpy as np
+from PIL import Image
+
+
+HASH_SIZE = 8            # 8×8 = 64-bit hashes
+PHASH_SAMPLE = 32        # pHash DCT input size
+HASH_BITS = HASH_SIZE * HASH_SIZE
+
+
+def _dct_matrix(n):
+    """
+    Orthonormal DCT-II basis (NumPy only, no SciPy needed).
+    """
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_SAMPLE)
+
+
+def _bits_to_int(bits):
+    return int(np.packbits(bits.ravel()).view(">u8")[0])
+
+
+# ---------------------------------------------------------
+# Hashes
+# ---------------------------------------------------------
+
+def dhash_pixels(gray):
+    """
+    Difference hash: is each pixel brighter than its left neighbour.
+    gray: (HASH_SIZE, HASH_SIZE + 1) array
+    """
+    return _bits_to_int(gray[:, 1:] > gray[:, :-1])
+
+
+def phash_pixels(gray):
+    """
+    DCT hash: low-frequency coefficients above their median.
+    gray: (PHASH_SAMPLE, PHASH_SAMPLE) array
+    """
+    coefficients = _DCT @ gray @ _DCT.T
+    low = coefficients[:HASH_SIZE, :HASH_SIZE].ravel()
+    median = np.median(low[1:])  # DC term skews the median
+    return _bits_to_int(low > median)
+
+
+def hash_image(path):
+    """
+    (dhash, phash) as unsigned 64-bit ints, or None if unreadable.
+    Runs in worker processes: module-level, picklable arguments only.
+    """
+    try:
+        with Image.open(path) as img:
+            # JPEG: decode at 1/8 scale, the hashes only need 32×32
+            img.draft("L", (PHASH_SAMPLE * 4, PHASH_SAMPLE * 4))
+            gray = img.convert("L")
+            gray = gray.resize(
+                (PHASH_SAMPLE, PHASH_SAMPLE), Image.LANCZOS, reducing_gap=3.0
+            )
+    except Exception:
+        return None
+
+    pixels = np.asarray(gray, dtype=np.float64)
+    small = np.asarray(
+        gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS),
+        dtype=np.float64
+    )
+
+    return dhash_pixels(small), phash_pixels(pixels)
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
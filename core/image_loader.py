@@ -1,23 +1,147 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from core import tracing
+from core.image_probe import probe_dimensions
 
 SUPPORTED_FORMATS = [".png", ".jpg", ".jpeg", ".webp"]
 
+INDEX_FLUSH_SIZE = 1000   # probed entries written to the index per commit
+SCAN_WORKERS = 8          # directories listed concurrently (I/O bound)
 
-def scan_images(folder_path):
-    folder = Path(folder_path)
-    images = []
+_SUPPORTED_SUFFIXES = frozenset(SUPPORTED_FORMATS)
 
-    def scan_directory(directory):
-        # 1️⃣ Add images in this directory first
-        for file in sorted(directory.iterdir()):
-            if file.is_file() and file.suffix.lower() in SUPPORTED_FORMATS:
-                images.append(file)
 
-        # 2️⃣ Then scan subdirectories
-        for sub in sorted(directory.iterdir()):
-            if sub.is_dir():
-                scan_directory(sub)
+def _sort_key(entry):
+    # Same order as sorted(Path.iterdir()) (case-insensitive on Windows)
+    return os.path.normcase(entry.name)
 
-    scan_directory(folder)
 
-    return images
\ No newline at end of file
+@tracing.traced("scan.list_directory")
+def list_directory(directory):
+    """
+    One scandir pass: (image paths, subdirectory paths), both sorted.
+    DirEntry types come from the directory listing, no extra stat.
+    """
+    files = []
+    subdirs = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        suffix = os.path.splitext(entry.name)[1].lower()
+                        if suffix in _SUPPORTED_SUFFIXES:
+                            files.append(entry)
+                    elif entry.is_dir():
+                        subdirs.append(entry)
+                except OSError:
+                    continue
+    except OSError:
+        pass  # unreadable directory → skip it
+
+    files.sort(key=_sort_key)
+    subdirs.sort(key=_sort_key)
+
+    return [e.path for e in files], [e.path for e in subdirs]
+
+
+def scan_images(folder_path, max_workers=SCAN_WORKERS):
+    """
+    Yield image paths under folder_path.
+
+    Order matches the old recursive scan:
+    1️⃣ images in a directory first, 2️⃣ then each sorted subdirectory.
+    Subdirectories are listed ahead of time on a bounded pool,
+    while the caller consumes the current one.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    try:
+        stack = [iter([pool.submit(list_directory, str(folder_path))])]
+
+        while stack:
+            future = next(stack[-1], None)
+            if future is None:
+                stack.pop()
+                continue
+
+            files, subdirs = future.result()
+
+            # Prefetch children before handing out this directory's files
+            children = [pool.submit(list_directory, d) for d in subdirs]
+
+            for file in files:
+                yield Path(file)
+
+            stack.append(iter(children))
+
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def build_record(img_path, width, height):
+    img_path = Path(img_path)
+    parent_path = img_path.parent
+
+    return {
+        "path": str(img_path),
+        "folder": str(parent_path),
+        "name": img_path.name,
+        "width": width,
+        "height": height,
+        "resolution": width * height,
+        "rating": 0   # ⭐ default rating
+    }
+
+
+def load_records(folder_path, index=None):
+    """
+    Yield one record per image under folder_path.
+
+    With a DatasetIndex, unchanged files (same size and mtime) are
+    served from it and only new or modified files are probed.
+    Entries for vanished files are dropped once the scan completes.
+    """
+    with tracing.span("scan.index_load"):
+        known = index.load(folder_path) if index else {}
+    seen = set()
+    updates = []
+    completed = False
+
+    try:
+        for img_path in scan_images(folder_path):
+            path = str(img_path)
+
+            try:
+                st = os.stat(path)
+                entry = known.get(path)
+
+                if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                    width, height = entry[2], entry[3]
+                else:
+                    with tracing.span("scan.probe"):
+                        width, height = probe_dimensions(path)
+                    updates.append(
+                        (path, st.st_size, st.st_mtime_ns, width, height)
+                    )
+            except Exception:
+                continue
+
+            seen.add(path)
+
+            if index and len(updates) >= INDEX_FLUSH_SIZE:
+                index.upsert(updates)
+                updates = []
+
+            yield build_record(img_path, width, height)
+
+        completed = True
+
+    finally:
+        # Keep what was probed even if the scan was interrupted
+        if index:
+            index.upsert(updates)
+            if completed:
+                index.remove(p for p in known if p not in seen)
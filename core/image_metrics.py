@@ -0,0 +1,49 @@
+import numpy as np
+
+from core.image_decode import decode_reduced
+
+
+# Order of the values everywhere (store columns, table columns)
+METRICS = ("sharpness", "brightness", "contrast", "saturation")
+
+# Metrics are measured on a fixed-size reduced decode, so sharpness
+# is comparable between a 512 px and a 6000 px image
+ANALYSIS_SIZE = 512
+
+
+def laplacian_variance(gray):
+    """
+    Variance of the 4-neighbour Laplacian: low = blurry.
+    """
+    lap = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+        - 4 * gray[1:-1, 1:-1]
+    )
+    return float(lap.var()) if lap.size else 0.0
+
+
+def compute_metrics(path):
+    """
+    (sharpness, brightness, contrast, saturation) or None if unreadable.
+
+    brightness: mean luma 0-255
+    contrast:   luma standard deviation
+    saturation: mean HSV saturation 0-255
+    Runs in worker processes: module-level, picklable arguments only.
+    """
+    try:
+        img = decode_reduced(path, ANALYSIS_SIZE)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+    except Exception:
+        return None
+
+    gray = np.asarray(img.convert("L"), dtype=np.float32)
+    saturation = np.asarray(img.convert("HSV"))[..., 1]
+
+    return (
+        laplacian_variance(gray),
+        float(gray.mean()),
+        float(gray.std()),
+        float(saturation.mean()),
+    )
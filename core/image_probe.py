@@ -0,0 +1,130 @@
+import struct
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# SOFn markers carry the frame size (C4/C8/CC are DHT/JPG/DAC)
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+
+
+# ---------------------------------------------------------
+# Header Parsers
+# ---------------------------------------------------------
+
+def _png_size(head):
+    if head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def _webp_size(head):
+    chunk = head[12:16]
+    data = head[20:]
+
+    if chunk == b"VP8 " and len(data) >= 10:
+        if data[3:6] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack("<HH", data[6:10])
+        return width & 0x3FFF, height & 0x3FFF
+
+    if chunk == b"VP8L" and len(data) >= 5:
+        if data[0] != 0x2F:
+            return None
+        bits = int.from_bytes(data[1:5], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+
+    if chunk == b"VP8X" and len(data) >= 10:
+        width = int.from_bytes(data[4:7], "little") + 1
+        height = int.from_bytes(data[7:10], "little") + 1
+        return width, height
+
+    return None
+
+
+def _jpeg_size(f):
+    f.seek(2)  # past SOI
+
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+
+        # Skip fill bytes
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            return None
+
+        marker = marker[0]
+
+        if marker in JPEG_STANDALONE_MARKERS or marker == 0x00:
+            continue
+        if marker == 0xD9:  # EOI before any frame
+            return None
+
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return width, height
+
+        f.seek(length - 2, 1)
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def probe_header(path):
+    """
+    Read (width, height) from the file header only.
+    Returns None when the format is not recognised.
+    """
+    with open(path, "rb") as f:
+        head = f.read(32)
+
+        if head.startswith(PNG_SIGNATURE):
+            return _png_size(head)
+
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return _webp_size(head)
+
+        if head[:2] == b"\xff\xd8":
+            return _jpeg_size(f)
+
+    return None
+
+
+def probe_dimensions(path):
+    """
+    Fast (width, height) lookup.
+    Falls back to PIL when the header parser gives up.
+    Raises on unreadable files, like Image.open does.
+    """
+    try:
+        size = probe_header(path)
+    except (OSError, struct.error):
+        size = None
+
+    if size and size[0] > 0 and size[1] > 0:
+        return size
+
+    from PIL import Image
+
+    with Image.open(path) as img:
+        return img.size
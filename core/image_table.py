@@ -0,0 +1,273 @@
+import os
+import numpy as np
+
+from core.image_metrics import METRICS
+
+
+# Bits of the flags column (set by analysis passes, shown as badges)
+FLAG_DUPLICATE = 1
+
+
+class ImageTable:
+    """
+    Columnar storage for the loaded image records.
+
+    - Paths stay a plain list of strings
+    - Folders are interned: each row stores a folder id
+    - Numeric columns (width, height, resolution, rating) are NumPy arrays
+    - Rows are never renumbered: removed rows are only marked dead,
+      so row ids stay valid until the next full load
+    - path_index maps every live path to its row (O(1) lookups)
+    - flags is a bitmask column for markers like FLAG_DUPLICATE,
+      group the near-duplicate group id (-1 = none)
+    - One float32 column per quality metric (NaN = not measured yet)
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self.paths = []
+        self.path_index = {}    # live path → row
+        self.folders = []       # folder id → folder path
+        self.folder_ids = {}    # folder path → folder id
+
+        self.count = 0
+        self._allocate(self.INITIAL_CAPACITY)
+
+    def _allocate(self, capacity):
+        def grow(old, dtype, fill=0):
+            new = np.full(capacity, fill, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.folder_id = grow(getattr(self, "folder_id", None), np.int32)
+        self.width = grow(getattr(self, "width", None), np.int32)
+        self.height = grow(getattr(self, "height", None), np.int32)
+        self.resolution = grow(getattr(self, "resolution", None), np.int64)
+        self.rating = grow(getattr(self, "rating", None), np.int8)
+        self.flags = grow(getattr(self, "flags", None), np.uint8)
+        self.group = grow(getattr(self, "group", None), np.int32, -1)
+
+        for name in METRICS:
+            setattr(self, name, grow(getattr(self, name, None), np.float32, np.nan))
+        self.alive = grow(getattr(self, "alive", None), np.bool_, False)
+
+    def __len__(self):
+        return self.count
+
+    # ---------------------------------------------------------
+    # Building
+    # ---------------------------------------------------------
+
+    def intern_folder(self, folder):
+        folder_id = self.folder_ids.get(folder)
+        if folder_id is None:
+            folder_id = len(self.folders)
+            self.folders.append(folder)
+            self.folder_ids[folder] = folder_id
+        return folder_id
+
+    def extend(self, records):
+        """
+        Append loader records (dicts), return the new row ids.
+        """
+        first = self.count
+        needed = first + len(records)
+
+        if needed > len(self.alive):
+            capacity = len(self.alive)
+            while capacity < needed:
+                capacity *= 2
+            self._allocate(capacity)
+
+        for row, record in enumerate(records, start=first):
+            self.paths.append(record["path"])
+            self.path_index[record["path"]] = row
+            self.folder_id[row] = self.intern_folder(record["folder"])
+            self.width[row] = record["width"]
+            self.height[row] = record["height"]
+            self.resolution[row] = record["resolution"]
+            self.rating[row] = record.get("rating", 0)
+            self.flags[row] = 0
+            self.group[row] = -1
+            for name in METRICS:
+                getattr(self, name)[row] = np.nan
+            self.alive[row] = True
+
+        self.count = needed
+        return np.arange(first, needed, dtype=np.int64)
+
+    def remove(self, rows):
+        self.alive[rows] = False
+
+        for row in rows:
+            path = self.paths[row]
+            if self.path_index.get(path) == row:
+                del self.path_index[path]
+
+    def rename(self, moves):
+        """
+        moves: {old path: new path} (files moved on disk).
+        Rows keep their id and every column (rating, metrics, flags);
+        returns the renamed rows.
+        """
+        rows = []
+
+        for old, new in moves.items():
+            row = self.path_index.pop(old, None)
+            if row is None:
+                continue
+
+            self.paths[row] = new
+            self.path_index[new] = row
+            self.folder_id[row] = self.intern_folder(os.path.dirname(new))
+            rows.append(row)
+
+        return np.asarray(rows, dtype=np.int64)
+
+    def update_files(self, dimensions):
+        """
+        dimensions: {path: (width, height)} of files changed in place.
+        Rating and flags stay, metrics are unknown again;
+        returns the updated rows.
+        """
+        rows = []
+
+        for path, (width, height) in dimensions.items():
+            row = self.path_index.get(path)
+            if row is None:
+                continue
+
+            self.width[row] = width
+            self.height[row] = height
+            self.resolution[row] = width * height
+            for name in METRICS:
+                getattr(self, name)[row] = np.nan
+            rows.append(row)
+
+        return np.asarray(rows, dtype=np.int64)
+
+    # ---------------------------------------------------------
+    # Access
+    # ---------------------------------------------------------
+
+    def row_for_path(self, path):
+        return self.path_index.get(path)
+
+    def name(self, row):
+        return os.path.basename(self.paths[row])
+
+    def folder(self, row):
+        return self.folders[self.folder_id[row]]
+
+    def live_rows(self):
+        return np.flatnonzero(self.alive[:self.count])
+
+    def rows_in_folders(self, folder_ids):
+        rows = self.live_rows()
+        return rows[np.isin(self.folder_id[rows], list(folder_ids))]
+
+    def set_groups(self, groups):
+        """
+        groups: lists of paths. Marks every member FLAG_DUPLICATE with
+        its group id; previous groups are cleared.
+        """
+        self.flags[:self.count] &= ~np.uint8(FLAG_DUPLICATE)
+        self.group[:self.count] = -1
+
+        for group_id, paths in enumerate(groups):
+            rows = [r for r in map(self.path_index.get, paths) if r is not None]
+            self.flags[rows] |= FLAG_DUPLICATE
+            self.group[rows] = group_id
+
+    def set_metrics(self, metrics):
+        """
+        metrics: {path: (sharpness, brightness, contrast, saturation)}
+        Returns the rows that were updated.
+        """
+        rows = []
+        values = []
+        for path, row_values in metrics.items():
+            row = self.path_index.get(path)
+            if row is not None:
+                rows.append(row)
+                values.append(row_values)
+
+        if rows:
+            values = np.asarray(values, dtype=np.float32)
+            for i, name in enumerate(METRICS):
+                getattr(self, name)[rows] = values[:, i]
+
+        return np.asarray(rows, dtype=np.int64)
+
+    def record(self, row):
+        """
+        Dict view of one row (for code that wants the old record shape).
+        """
+        return {
+            "path": self.paths[row],
+            "folder": self.folder(row),
+            "name": self.name(row),
+            "width": int(self.width[row]),
+            "height": int(self.height[row]),
+            "resolution": int(self.resolution[row]),
+            "rating": int(self.rating[row]),
+        }
+
+    # ---------------------------------------------------------
+    # Vectorized Filtering
+    # ---------------------------------------------------------
+
+    def select(
+        self, rows=None, folders=None, size_range=None,
+        min_size=None, ratings=None, flags=None, metric_ranges=None
+    ):
+        """
+        Return the subset of rows (all live rows by default) passing
+        every given filter, in the original order.
+
+        folders:    iterable of folder paths, or None for no folder filter
+        size_range: (min, max) applied to max(width, height)
+        min_size:   (min_width, min_height)
+        ratings:    iterable of accepted ratings
+        flags:      bitmask, rows need at least one of its bits set
+        metric_ranges: {metric: (min, max)}, either bound may be None;
+                    unmeasured rows never pass
+        """
+        if rows is None:
+            rows = self.live_rows()
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            rows = rows[self.alive[rows]]
+
+        mask = np.ones(len(rows), dtype=np.bool_)
+
+        if folders is not None:
+            ids = [self.folder_ids[f] for f in folders if f in self.folder_ids]
+            mask &= np.isin(self.folder_id[rows], ids)
+
+        if size_range:
+            min_val, max_val = size_range
+            longest = np.maximum(self.width[rows], self.height[rows])
+            mask &= (longest >= min_val) & (longest <= max_val)
+
+        if min_size:
+            min_width, min_height = min_size
+            mask &= (self.width[rows] >= min_width) & (self.height[rows] >= min_height)
+
+        if ratings is not None:
+            mask &= np.isin(self.rating[rows], list(ratings))
+
+        if flags:
+            mask &= (self.flags[rows] & flags) != 0
+
+        for name, (low, high) in (metric_ranges or {}).items():
+            values = getattr(self, name)[rows]
+            mask &= ~np.isnan(values)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+
+        return rows[mask]
@@ -1,40 +1,55 @@
+import time
 from PySide6.QtCore import QThread, Signal
-from pathlib import Path
-from PIL import Image
-from core.image_loader import scan_images
+from core import tracing
+from core.dataset_index import DatasetIndex
+from core.image_loader import load_records
 
 
 class ImageLoaderWorker(QThread):
-    finished_loading = Signal(list)
+    """
+    Probes images in the background and streams records
+    in batches, so the gallery fills up while scanning.
+    """
 
-    def __init__(self, folder_path):
+    batch_loaded = Signal(list)
+    finished_loading = Signal()
+
+    BATCH_SIZE = 256        # records per batch at most
+    BATCH_INTERVAL = 0.1    # seconds before a partial batch is flushed
+
+    def __init__(self, folder_path, index_path=None):
         super().__init__()
         self.folder_path = folder_path
+        self.index_path = index_path
 
+    @tracing.traced("loader.run")
     def run(self):
-        images_data = []
-        root = Path(self.folder_path)
+        batch = []
+        last_emit = time.monotonic()
 
-        image_paths = scan_images(self.folder_path)
+        with DatasetIndex.open_in_thread(self.index_path) as index:
+            records = load_records(self.folder_path, index)
 
-        for img_path in image_paths:
             try:
-                img = Image.open(img_path)
-                width, height = img.size
-
-                parent_path = Path(img_path).parent
-                depth = len(parent_path.relative_to(root).parts)
-
-                images_data.append({
-                    "path": str(img_path),
-                    "folder": str(parent_path),
-                    "name": Path(img_path).name,
-                    "width": width,
-                    "height": height,
-                    "resolution": width * height,
-                    "rating": 0   # ⭐ default rating
-                })
-            except:
-                continue
-
-        self.finished_loading.emit(images_data)
\ No newline at end of file
+                for record in records:
+                    if self.isInterruptionRequested():
+                        return
+
+                    batch.append(record)
+
+                    now = time.monotonic()
+                    if (
+                        len(batch) >= self.BATCH_SIZE
+                        or now - last_emit >= self.BATCH_INTERVAL
+                    ):
+                        self.batch_loaded.emit(batch)
+                        batch = []
+                        last_emit = now
+
+                if batch:
+                    self.batch_loaded.emit(batch)
+
+                self.finished_loading.emit()
+
+            finally:
+                records.close()
@@ -0,0 +1,449 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core import tracing
+
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------
+# JSON Files (original layout)
+# ---------------------------------------------------------
+
+class JsonRatingBackend:
+    """
+    Ratings split over per-subfolder JSON files.
+
+    - <metadata_root>/ratings.json for images in the dataset root
+    - <metadata_root>/<subfolder>-ratings.json for first-level subfolders
+    - <folder>/.ratings.json when outside the dataset base
+    - Write-behind: changes mark files dirty, each dirty file is
+      flushed once after a short debounce (or on flush()/close())
+    - A failed write stays dirty and is retried with growing delays
+    """
+
+    FLUSH_DELAY = 1.0       # seconds of quiet before dirty files are written
+    MAX_RETRY_DELAY = 60.0  # backoff cap while writing keeps failing
+
+    def __init__(self, metadata_root, dataset_name):
+        self.metadata_root = Path(metadata_root)
+        self.dataset_name = dataset_name
+
+        self.metadata_cache = {}  # {metadata_path: ratings_dict}
+        self.dirty_files = set()
+
+        self._lock = threading.RLock()        # cache + dirty set
+        self._write_lock = threading.Lock()   # one flush at a time
+
+        # One flush thread per backend, re-armed by moving the deadline
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_thread = None
+        self._flush_due = None      # time.monotonic() of the next flush
+        self._retry_delay = 0.0     # > 0 while writing fails
+
+    # ---------------------------------------------------------
+    # Metadata File Resolver (IMAGE-DRIVEN)
+    # ---------------------------------------------------------
+
+    def resolve_metadata_file(self, relative_path):
+        """
+        Decide which metadata file to use based on image path.
+        """
+
+        if not self.dataset_name:
+            # Fallback local metadata
+            return self.metadata_root / ".ratings.json"
+
+        parts = Path(relative_path).parts
+
+        if len(parts) == 1:
+            # Image in dataset root
+            return self.metadata_root / "ratings.json"
+        else:
+            # Image in first-level subfolder
+            first_subfolder = parts[0]
+            return self.metadata_root / f"{first_subfolder}-ratings.json"
+
+    def metadata_files(self):
+        """
+        Every ratings file currently on disk for this dataset.
+        """
+        if not self.dataset_name:
+            files = [self.metadata_root / ".ratings.json"]
+        else:
+            files = sorted(self.metadata_root.glob("*ratings.json"))
+
+        return [f for f in files if f.is_file()]
+
+    # ---------------------------------------------------------
+    # Load / Save Metadata File
+    # ---------------------------------------------------------
+
+    def load_metadata_file(self, metadata_file):
+        with self._lock:
+            if metadata_file in self.metadata_cache:
+                return self.metadata_cache[metadata_file]
+
+        if metadata_file.exists():
+            try:
+                with open(metadata_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except:
+                data = {}
+        else:
+            data = {}
+
+        with self._lock:
+            return self.metadata_cache.setdefault(metadata_file, data)
+
+    @tracing.traced("metadata.save_metadata_file")
+    def save_metadata_file(self, metadata_file):
+        with self._lock:
+            data = dict(self.metadata_cache.get(metadata_file, {}))
+
+        # 🔥 Ensure parent directory exists
+        metadata_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # Atomic replace: a crash mid-write never truncates ratings
+        fd, tmp_path = tempfile.mkstemp(
+            dir=metadata_file.parent, prefix=metadata_file.name, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp_path, metadata_file)
+        except:
+            os.unlink(tmp_path)
+            raise
+
+    # ---------------------------------------------------------
+    # Write-Behind
+    # ---------------------------------------------------------
+
+    def mark_dirty(self, metadata_file):
+        with self._lock:
+            self.dirty_files.add(metadata_file)
+            self._schedule_flush(max(self.FLUSH_DELAY, self._retry_delay))
+
+    def _schedule_flush(self, delay):
+        """
+        (Re)arm the flush thread, starting it on first use.
+        """
+        with self._lock:
+            self._flush_due = time.monotonic() + delay
+
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop, daemon=True
+                )
+                self._flush_thread.start()
+
+            self._wakeup.notify()
+
+    def _flush_loop(self):
+        thread = threading.current_thread()
+
+        while True:
+            with self._lock:
+                while self._flush_thread is thread:
+                    if self._flush_due is None:
+                        self._wakeup.wait()
+                        continue
+
+                    remaining = self._flush_due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+
+                if self._flush_thread is not thread:
+                    return  # closed
+
+                self._flush_due = None
+
+            self.flush()
+
+    def flush(self):
+        """
+        Write every dirty metadata file once.
+        Files that fail stay dirty and are retried with backoff.
+        """
+        with self._write_lock:
+            with self._lock:
+                dirty = self.dirty_files
+                self.dirty_files = set()
+
+            failed = []
+            for metadata_file in dirty:
+                try:
+                    self.save_metadata_file(metadata_file)
+                except OSError as e:
+                    logger.warning("Saving ratings to %s failed: %s", metadata_file, e)
+                    failed.append(metadata_file)
+
+            with self._lock:
+                if not failed:
+                    self._retry_delay = 0.0
+                    return
+
+                self.dirty_files.update(failed)
+                self._retry_delay = min(
+                    max(2 * self._retry_delay, 2 * self.FLUSH_DELAY),
+                    self.MAX_RETRY_DELAY
+                )
+
+                # After close() nobody is listening, close() logs instead
+                if self._flush_thread is not None:
+                    self._schedule_flush(self._retry_delay)
+
+    def close(self):
+        """
+        Stop the flush thread and flush now.
+        """
+        with self._lock:
+            self._flush_thread = None
+            self._flush_due = None
+            self._wakeup.notify_all()
+
+        self.flush()
+
+        with self._lock:
+            if self.dirty_files:
+                logger.error(
+                    "%d ratings file(s) could not be saved", len(self.dirty_files)
+                )
+
+    # ---------------------------------------------------------
+    # Rating API
+    # ---------------------------------------------------------
+
+    def get_rating(self, relative_path):
+        metadata_file = self.resolve_metadata_file(relative_path)
+        data = self.load_metadata_file(metadata_file)
+        return data.get(relative_path, 0)
+
+    def get_ratings(self, relative_paths):
+        return {p: self.get_rating(p) for p in relative_paths}
+
+    def set_ratings(self, ratings):
+        touched = set()
+
+        with self._lock:
+            for relative_path, rating in ratings.items():
+                metadata_file = self.resolve_metadata_file(relative_path)
+                data = self.load_metadata_file(metadata_file)
+
+                if rating == 0:
+                    data.pop(relative_path, None)
+                else:
+                    data[relative_path] = rating
+
+                touched.add(metadata_file)
+
+        for metadata_file in touched:
+            self.mark_dirty(metadata_file)
+
+    def replace_all(self, ratings):
+        """
+        Make the files hold exactly ratings (used by the exporter).
+        """
+        with self._lock:
+            for metadata_file in self.metadata_files():
+                self.load_metadata_file(metadata_file).clear()
+                self.mark_dirty(metadata_file)
+
+        self.set_ratings(ratings)
+
+    def all_ratings(self):
+        ratings = {}
+        for metadata_file in self.metadata_files():
+            ratings.update(self.load_metadata_file(metadata_file))
+
+        # Files not written yet still live in the cache
+        with self._lock:
+            for data in self.metadata_cache.values():
+                ratings.update(data)
+
+        return ratings
+
+    def clean_orphan_entries(self, valid_set):
+        with self._lock:
+            for metadata_file, data in self.metadata_cache.items():
+                removed = False
+                for key in list(data.keys()):
+                    if key not in valid_set:
+                        data.pop(key)
+                        removed = True
+
+                if removed:
+                    self.mark_dirty(metadata_file)
+
+
+# ---------------------------------------------------------
+# SQLite (WAL)
+# ---------------------------------------------------------
+
+class SqliteRatingBackend:
+    """
+    Ratings in one embedded SQLite database per dataset.
+
+    - WAL journal: readers never block the writer
+    - Point updates and bulk upserts in a single transaction
+    - Indexed lookup by relative path (primary key)
+    """
+
+    LOOKUP_CHUNK = 500  # host parameters per IN (...) query
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ratings ("
+            "path TEXT PRIMARY KEY, rating INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    # ---------------------------------------------------------
+    # Migration Bookkeeping
+    # ---------------------------------------------------------
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, str(value))
+            )
+
+    def delete_meta(self, key):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+
+    # ---------------------------------------------------------
+    # Rating API
+    # ---------------------------------------------------------
+
+    def get_rating(self, relative_path):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rating FROM ratings WHERE path = ?", (relative_path,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_ratings(self, relative_paths):
+        relative_paths = list(relative_paths)
+        ratings = dict.fromkeys(relative_paths, 0)
+
+        with self._lock:
+            for i in range(0, len(relative_paths), self.LOOKUP_CHUNK):
+                chunk = relative_paths[i:i + self.LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                ratings.update(self._conn.execute(
+                    f"SELECT path, rating FROM ratings WHERE path IN ({placeholders})",
+                    chunk
+                ))
+
+        return ratings
+
+    def set_ratings(self, ratings):
+        upserts = [(p, r) for p, r in ratings.items() if r != 0]
+        deletes = [(p,) for p, r in ratings.items() if r == 0]
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO ratings (path, rating) VALUES (?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET rating = excluded.rating",
+                upserts
+            )
+            self._conn.executemany("DELETE FROM ratings WHERE path = ?", deletes)
+
+    def replace_all(self, ratings):
+        """
+        Make the table hold exactly ratings (used by the importer).
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ratings")
+            self._conn.executemany(
+                "INSERT INTO ratings (path, rating) VALUES (?, ?)",
+                ((p, r) for p, r in ratings.items() if r != 0)
+            )
+
+    def all_ratings(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT path, rating FROM ratings"))
+
+    def clean_orphan_entries(self, valid_set):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS valid_paths "
+                "(path TEXT PRIMARY KEY)"
+            )
+            self._conn.execute("DELETE FROM valid_paths")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO valid_paths (path) VALUES (?)",
+                ((p,) for p in valid_set)
+            )
+            self._conn.execute(
+                "DELETE FROM ratings "
+                "WHERE path NOT IN (SELECT path FROM valid_paths)"
+            )
+            self._conn.execute("DELETE FROM valid_paths")
+
+    def flush(self):
+        pass  # every change is committed immediately
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------
+# JSON ⇄ SQLite Migration
+# ---------------------------------------------------------
+
+# meta "json_imported" set: the database holds the current ratings,
+# cleared again once they were exported back to the JSON files
+
+def import_json_ratings(json_backend, sqlite_backend):
+    """
+    Make the database a copy of the JSON files (removals included).
+    Returns the number of entries imported.
+    """
+    ratings = json_backend.all_ratings()
+    sqlite_backend.replace_all(ratings)
+    sqlite_backend.set_meta("json_imported", 1)
+    return len(ratings)
+
+
+def export_json_ratings(sqlite_backend, json_backend):
+    """
+    Write the database back out in the JSON file layout.
+    Returns the number of entries exported.
+    """
+    ratings = sqlite_backend.all_ratings()
+    json_backend.replace_all(ratings)
+    json_backend.close()  # flush now, the database stops being current
+    sqlite_backend.delete_meta("json_imported")
+    return len(ratings)
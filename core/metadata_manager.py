@@ -1,5 +1,11 @@
-import json
 from pathlib import Path
+from core.metadata_backends import (
+    JsonRatingBackend, SqliteRatingBackend,
+    export_json_ratings, import_json_ratings
+)
+
+
+BACKENDS = ("json", "sqlite")
 
 
 class MetadataManager:
@@ -7,12 +13,15 @@ class MetadataManager:
     Image-driven metadata manager.
 
     - Supports dataset base architecture
-    - Uses first-level subfolder rule
-    - Chooses metadata file based on image relative path
-    - Caches multiple metadata files in memory
+    - Uses first-level subfolder rule (JSON layout)
+    - Ratings live in a pluggable backend:
+      "json"   → per-subfolder *-ratings.json files (write-behind)
+      "sqlite" → one ratings.db per dataset (WAL, point updates)
+    - Switching backends carries the ratings over: JSON → SQLite
+      imports the files, SQLite → JSON exports the database
     """
 
-    def __init__(self, current_folder, dataset_base_path=None):
+    def __init__(self, current_folder, dataset_base_path=None, backend="json"):
         self.current_folder = Path(current_folder)
         self.dataset_base = (
             Path(dataset_base_path)
@@ -22,10 +31,11 @@ class MetadataManager:
         self.dataset_name = None
         self.metadata_root = None
 
-        self.metadata_cache = {}  # {metadata_path: ratings_dict}
-
         self.initialize_dataset_context()
 
+        self.backend_name = backend if backend in BACKENDS else "json"
+        self.backend = self.create_backend(self.backend_name)
+
     # ---------------------------------------------------------
     # Dataset Context Setup
     # ---------------------------------------------------------
@@ -58,90 +68,103 @@ class MetadataManager:
             self.metadata_root = self.current_folder
 
     # ---------------------------------------------------------
-    # Metadata File Resolver (IMAGE-DRIVEN)
+    # Storage
     # ---------------------------------------------------------
 
-    def resolve_metadata_file(self, relative_path):
+    def resolve_store_file(self, name):
         """
-        Decide which metadata file to use based on image path.
+        Path for an auxiliary per-dataset store (thumbnails, index, ...).
+        Hidden when falling back to the local folder.
         """
 
         if not self.dataset_name:
-            # Fallback local metadata
-            return self.metadata_root / ".ratings.json"
+            return self.metadata_root / f".{name}"
 
-        parts = Path(relative_path).parts
+        return self.metadata_root / name
 
-        if len(parts) == 1:
-            # Image in dataset root
-            return self.metadata_root / "ratings.json"
-        else:
-            # Image in first-level subfolder
-            first_subfolder = parts[0]
-            return self.metadata_root / f"{first_subfolder}-ratings.json"
+    def create_backend(self, name):
+        json_backend = JsonRatingBackend(self.metadata_root, self.dataset_name)
+        db_path = self.resolve_store_file("ratings.db")
 
-    # ---------------------------------------------------------
-    # Load Metadata File
-    # ---------------------------------------------------------
+        if name != "sqlite":
+            # Back from SQLite: ratings made there go to the files
+            if db_path.exists():
+                database = SqliteRatingBackend(db_path)
+                if database.get_meta("json_imported"):
+                    export_json_ratings(database, json_backend)
+                database.close()
 
-    def load_metadata_file(self, metadata_file):
-        if metadata_file in self.metadata_cache:
-            return self.metadata_cache[metadata_file]
+            return json_backend
 
-        if metadata_file.exists():
-            try:
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except:
-                data = {}
-        else:
-            data = {}
+        backend = SqliteRatingBackend(db_path)
 
-        self.metadata_cache[metadata_file] = data
-        return data
+        # Files are current (first switch, or edited on the JSON backend)
+        if not backend.get_meta("json_imported"):
+            import_json_ratings(json_backend, backend)
 
-    def save_metadata_file(self, metadata_file):
-        data = self.metadata_cache.get(metadata_file, {})
-
-        # 🔥 Ensure parent directory exists
-        metadata_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(metadata_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        return backend
 
     # ---------------------------------------------------------
     # Public Rating API
     # ---------------------------------------------------------
 
     def get_rating(self, relative_path):
-        metadata_file = self.resolve_metadata_file(relative_path)
-        data = self.load_metadata_file(metadata_file)
-        return data.get(relative_path, 0)
+        return self.backend.get_rating(relative_path)
+
+    def get_ratings(self, relative_paths):
+        """
+        {relative_path: rating} for many images in one call.
+        """
+        return self.backend.get_ratings(relative_paths)
 
     def set_rating(self, relative_path, rating):
-        metadata_file = self.resolve_metadata_file(relative_path)
-        data = self.load_metadata_file(metadata_file)
+        self.set_ratings({relative_path: rating})
 
-        if rating == 0:
-            data.pop(relative_path, None)
-        else:
-            data[relative_path] = rating
+    def set_ratings(self, ratings):
+        """
+        Bulk update: {relative_path: rating}. 0 removes the entry.
+        """
+        self.backend.set_ratings(ratings)
+
+    def move_entries(self, renames):
+        """
+        Carry ratings over to new relative paths after files moved:
+        {old_relative: new_relative}, None when the image left the
+        dataset (its entry is dropped). One batched write.
+        """
+        ratings = self.get_ratings(list(renames))
 
-        self.save_metadata_file(metadata_file)
+        changes = dict.fromkeys(renames, 0)
+        changes.update({
+            new: ratings[old]
+            for old, new in renames.items()
+            if new is not None and ratings[old]
+        })
+
+        self.set_ratings(changes)
+
+    def remove_entries(self, relative_paths):
+        """
+        Drop the entries of deleted images. One batched write.
+        """
+        self.set_ratings(dict.fromkeys(relative_paths, 0))
+
+    def all_ratings(self):
+        return self.backend.all_ratings()
+
+    def flush(self):
+        self.backend.flush()
+
+    def close(self):
+        """
+        Flush pending changes and release the backend
+        (shutdown, dataset switch).
+        """
+        self.backend.close()
 
     # ---------------------------------------------------------
     # Cleanup Orphan Entries
     # ---------------------------------------------------------
 
     def clean_orphan_entries(self, valid_relative_paths):
-        valid_set = set(valid_relative_paths)
-
-        for metadata_file, data in self.metadata_cache.items():
-            removed = False
-            for key in list(data.keys()):
-                if key not in valid_set:
-                    data.pop(key)
-                    removed = True
-
-            if removed:
-                self.save_metadata_file(metadata_file)
\ No newline at end of file
+        self.backend.clean_orphan_entries(set(valid_relative_paths))
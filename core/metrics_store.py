@@ -0,0 +1,15 @@
+from core.image_metrics import METRICS
+from core.path_store import PathStore
+
+
+class MetricsStore(PathStore):
+    """
+    Persistent image-quality metrics for one dataset.
+
+    - Entries are (path, size, mtime_ns, *metrics), in METRICS order
+    - Written in chunks while computing, so a long run can be
+      stopped and resumed in a later session
+    """
+
+    TABLE = "metrics"
+    COLUMNS = tuple((name, "REAL") for name in METRICS)
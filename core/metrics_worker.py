@@ -0,0 +1,39 @@
+from PySide6.QtCore import QThread, Signal
+from core.batch_pool import map_cached
+from core.image_metrics import compute_metrics
+from core.metrics_store import MetricsStore
+
+
+class MetricsWorker(QThread):
+    """
+    Computes quality metrics for the given images in a process pool.
+
+    - Already measured (unchanged) images come from the store
+    - Results are streamed in chunks as they are stored, so the
+      gallery can filter on them while the run continues
+    - cached_only: just load what earlier sessions stored
+    """
+
+    progress = Signal(int, int)     # done, total
+    metrics_ready = Signal(dict)    # {path: (sharpness, brightness, ...)}
+    finished_metrics = Signal()
+
+    def __init__(self, paths, root, store_path, cached_only=False):
+        super().__init__()
+        self.paths = paths
+        self.root = root
+        self.store_path = store_path
+        self.cached_only = cached_only
+
+    def run(self):
+        with MetricsStore.open_in_thread(self.store_path) as store:
+            results = map_cached(
+                None if self.cached_only else compute_metrics,
+                self.paths, store, self.root,
+                progress=self.progress.emit,
+                cancelled=self.isInterruptionRequested,
+                on_results=self.metrics_ready.emit
+            )
+
+        if results is not None:
+            self.finished_metrics.emit()
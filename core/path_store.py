@@ -0,0 +1,175 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class PathStore:
+    """
+    Per-dataset SQLite store keyed by image path.
+
+    - One SQLite file per dataset (lives in the metadata root)
+    - Every entry carries the file's size + mtime_ns, an entry is
+      valid while both still match the file on disk
+    - Subclasses name the table and the value columns stored
+      after (path, size, mtime_ns)
+    """
+
+    TABLE = None
+    COLUMNS = ()    # ((name, SQL type), ...)
+
+    def __init__(self, db_path, check_same_thread=True):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Only shared stores (thumbnails) need it, a free lock is cheap
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=check_same_thread
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        columns = "".join(
+            f", {name} {sql_type} NOT NULL" for name, sql_type in self.COLUMNS
+        )
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+            "path TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            f"mtime_ns INTEGER NOT NULL{columns})"
+        )
+        self._conn.commit()
+
+    @classmethod
+    @contextmanager
+    def open_in_thread(cls, db_path):
+        """
+        Open the store for the calling thread, closed on exit.
+
+        - SQLite connections stay in the thread that opened them, so
+          workers open their store here inside run(), not in __init__
+        - No db_path yields None (caching disabled)
+        """
+        if not db_path:
+            yield None
+            return
+
+        store = cls(db_path)
+        try:
+            yield store
+        finally:
+            store.close()
+
+    # ---------------------------------------------------------
+    # Value Conversion
+    # ---------------------------------------------------------
+
+    def to_sql(self, rows):
+        """
+        Rows as stored, override for values SQLite cannot hold as-is.
+        """
+        return rows
+
+    def from_sql(self, rows):
+        return rows
+
+    # ---------------------------------------------------------
+    # Read / Write
+    # ---------------------------------------------------------
+
+    def load(self, root):
+        """
+        {path: (size, mtime_ns, *values)} for every entry under root.
+        """
+        prefix = os.path.join(str(root), "")    # not /ds/a for /ds/ab
+        names = "".join(f", {name}" for name, _ in self.COLUMNS)
+
+        with self._lock:
+            if self._closed:
+                return {}
+            rows = self._conn.execute(
+                f"SELECT path, size, mtime_ns{names} FROM {self.TABLE} "
+                "WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchall()
+
+        return {row[0]: row[1:] for row in self.from_sql(rows)}
+
+    def lookup(self, paths):
+        """
+        {path: (size, mtime_ns, *values)} for the given paths
+        that have an entry (primary key lookups, no subtree scan).
+        """
+        names = "".join(f", {name}" for name, _ in self.COLUMNS)
+        sql = (
+            f"SELECT path, size, mtime_ns{names} FROM {self.TABLE} "
+            "WHERE path = ?"
+        )
+
+        with self._lock:
+            if self._closed:
+                return {}
+            rows = [
+                self._conn.execute(sql, (str(path),)).fetchone()
+                for path in paths
+            ]
+
+        return {
+            row[0]: row[1:]
+            for row in self.from_sql(row for row in rows if row is not None)
+        }
+
+    def upsert(self, rows):
+        """
+        rows: iterable of (path, size, mtime_ns, *values)
+        """
+        names = "".join(f", {name}" for name, _ in self.COLUMNS)
+        placeholders = ", ".join("?" * (3 + len(self.COLUMNS)))
+
+        self._write(
+            f"INSERT OR REPLACE INTO {self.TABLE} "
+            f"(path, size, mtime_ns{names}) VALUES ({placeholders})",
+            self.to_sql(rows)
+        )
+
+    def remove(self, paths):
+        """
+        Drop the entries of deleted files.
+        """
+        self._write(
+            f"DELETE FROM {self.TABLE} WHERE path = ?",
+            ((str(path),) for path in paths)
+        )
+
+    def rename(self, moves):
+        """
+        Re-key entries of moved files ({old path: new path}).
+        A move keeps size and mtime, so the entries stay valid.
+        """
+        self._write(
+            f"UPDATE OR REPLACE {self.TABLE} SET path = ? WHERE path = ?",
+            ((str(new), str(old)) for old, new in moves.items())
+        )
+
+    def _write(self, sql, rows):
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def close(self):
+        """
+        Safe to call while other threads still hold a reference:
+        later reads and writes become no-ops.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._conn.commit()
+            self._conn.close()
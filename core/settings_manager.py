@@ -17,7 +17,10 @@ class SettingsManager:
 
         # Default settings
         return {
-            "dataset_base_path": ""
+            "dataset_base_path": "",
+            "metadata_backend": "json",
+            "show_resolution_badge": False,
+            "thumbnail_cache_mb": 512
         }
 
     def save_settings(self):
@@ -29,4 +32,25 @@ class SettingsManager:
 
     def set_dataset_base_path(self, path):
         self.settings["dataset_base_path"] = path
-        self.save_settings()
\ No newline at end of file
+        self.save_settings()
+
+    def get_metadata_backend(self):
+        return self.settings.get("metadata_backend", "json")
+
+    def set_metadata_backend(self, backend):
+        self.settings["metadata_backend"] = backend
+        self.save_settings()
+
+    def get_show_resolution_badge(self):
+        return self.settings.get("show_resolution_badge", False)
+
+    def set_show_resolution_badge(self, enabled):
+        self.settings["show_resolution_badge"] = bool(enabled)
+        self.save_settings()
+
+    def get_thumbnail_cache_mb(self):
+        return int(self.settings.get("thumbnail_cache_mb", 512))
+
+    def set_thumbnail_cache_mb(self, megabytes):
+        self.settings["thumbnail_cache_mb"] = int(megabytes)
+        self.save_settings()
@@ -0,0 +1,221 @@
+"""
+Cold-start measurement.
+
+    python main.py --startup-report        # report on stderr
+    DMP_STARTUP_REPORT=1 python main.py    # same
+    DMP_STARTUP_REPORT=json python main.py # one JSON line (benchmarks)
+
+- mark(name): milestone, ms since main.py started
+- While enabled, every module import is timed (self / cumulative,
+  like python -X importtime) through a meta path hook
+- The report is printed once, at the first painted thumbnail (or
+  when the window is up and there is nothing to paint)
+"""
+
+import json
+import os
+import sys
+import time
+
+
+_START = time.perf_counter()
+
+REPORT_TOP = 25             # slowest imports listed in the text report
+REPORT_MIN_MS = 1.0         # ... and only if they took at least this
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+# ---------------------------------------------------------
+# Import Timing
+# ---------------------------------------------------------
+
+class _TimedLoader:
+    """
+    Wraps a module loader and times exec_module.
+    Everything else is forwarded, so resource readers etc. still work.
+    """
+
+    def __init__(self, loader, timer, name):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Leave the original loader on the module once it is loaded
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+
+        self._timer.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave(self._name)
+
+
+class ImportTimer:
+    """
+    Meta path finder that only wraps what the real finders return.
+
+    records: [(module, self_ms, cumulative_ms)] in completion order
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []    # [start, children_seconds]
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self, name)
+        return spec
+
+    def enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def leave(self, name):
+        start, children = self._stack.pop()
+        total = time.perf_counter() - start
+
+        if self._stack:
+            self._stack[-1][1] += total
+
+        self.records.append((name, _ms(total - children), _ms(total)))
+
+    def slowest(self, count=REPORT_TOP, min_ms=REPORT_MIN_MS):
+        ranked = sorted(self.records, key=lambda r: r[2], reverse=True)
+        return [r for r in ranked if r[2] >= min_ms][:count]
+
+
+# ---------------------------------------------------------
+# Milestones / Report
+# ---------------------------------------------------------
+
+_mode = None            # None (off), "text" or "json"
+_milestones = []        # [(name, ms)]
+_imports = None
+_reported = False
+_on_report = []
+
+
+def enable(mode="text"):
+    """
+    Start recording (called first thing in main.py).
+    """
+    global _mode, _imports
+
+    _mode = mode
+    if _imports is None:
+        _imports = ImportTimer()
+        _imports.install()
+
+
+def enabled():
+    return _mode is not None
+
+
+def configure(argv):
+    """
+    Enable from --startup-report or DMP_STARTUP_REPORT.
+    Returns argv without the flag.
+    """
+    mode = os.environ.get("DMP_STARTUP_REPORT", "").strip().lower()
+    if "--startup-report" in argv:
+        mode = mode if mode == "json" else "text"
+        argv = [a for a in argv if a != "--startup-report"]
+
+    if mode in ("1", "true", "yes", "text"):
+        enable("text")
+    elif mode == "json":
+        enable("json")
+
+    return argv
+
+
+def mark(name):
+    """
+    Record a milestone. Only the first mark of a name counts.
+    """
+    if _mode is None or any(n == name for n, _ in _milestones):
+        return
+    _milestones.append((name, _ms(time.perf_counter() - _START)))
+
+
+def on_report(callback):
+    """
+    callback() runs after the report is written
+    (the startup benchmark quits the app there).
+    """
+    _on_report.append(callback)
+
+
+def report(reason=None):
+    """
+    Print the report once. reason becomes the final milestone.
+    """
+    global _reported
+
+    if _mode is None or _reported:
+        return
+    _reported = True
+
+    if reason:
+        mark(reason)
+    if _imports is not None:
+        _imports.uninstall()
+
+    imports = _imports.slowest() if _imports else []
+    total_imports = round(sum(r[1] for r in _imports.records), 2) if _imports else 0
+
+    if _mode == "json":
+        data = {
+            "milestones": dict(_milestones),
+            "imports_ms": total_imports,
+            "modules": len(_imports.records) if _imports else 0,
+            "slowest_imports": [
+                {"module": n, "self_ms": s, "cumulative_ms": c}
+                for n, s, c in imports
+            ],
+        }
+        sys.stderr.write("STARTUP " + json.dumps(data) + "\n")
+    else:
+        lines = ["", "Startup (ms since main.py started)"]
+        lines += [f"  {ms:9.1f}  {name}" for name, ms in _milestones]
+        lines += [
+            "",
+            f"Imports: {len(_imports.records) if _imports else 0} modules, "
+            f"{total_imports:.1f} ms",
+            f"  {'self':>8} | {'cumulative':>10} | module",
+        ]
+        lines += [f"  {s:8.1f} | {c:10.1f} | {n}" for n, s, c in imports]
+        sys.stderr.write("\n".join(lines) + "\n")
+
+    sys.stderr.flush()
+
+    for callback in _on_report:
+        callback()
@@ -0,0 +1,136 @@
+import io
+import os
+
+from core.path_store import PathStore
+
+
+class ThumbnailStore(PathStore):
+    """
+    Disk-backed thumbnail cache.
+
+    - An entry is valid while source path, size and mtime match
+    - Stale entries are simply overwritten on the next put()
+    - Shared by the decoder threads, every access takes the lock
+    """
+
+    TABLE = "thumbnails"
+    COLUMNS = (("thumb_size", "INTEGER"), ("data", "BLOB"))
+
+    def __init__(self, db_path, thumb_size):
+        super().__init__(db_path, check_same_thread=False)
+        self.thumb_size = thumb_size
+
+    # ---------------------------------------------------------
+    # Validity Key
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def stat_key(path):
+        """
+        (size, mtime_ns) of the source file, or None if it is gone.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    # ---------------------------------------------------------
+    # Read / Write
+    # ---------------------------------------------------------
+
+    def get(self, path, key=None):
+        """
+        Return encoded thumbnail bytes, or None when missing or stale.
+        """
+        key = key or self.stat_key(path)
+        if key is None:
+            return None
+
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, thumb_size, data "
+                "FROM thumbnails WHERE path = ?",
+                (str(path),)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        size, mtime_ns, thumb_size, data = row
+        if (size, mtime_ns) != key or thumb_size != self.thumb_size:
+            return None
+
+        return data
+
+    def put(self, path, image, key=None):
+        """
+        Encode a PIL thumbnail and store it.
+        Call commit() once a batch is done.
+        """
+        key = key or self.stat_key(path)
+        if key is None:
+            return
+
+        data = self.encode(image)
+
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO thumbnails "
+                "(path, size, mtime_ns, thumb_size, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(path), key[0], key[1], self.thumb_size, data)
+            )
+
+    @staticmethod
+    def encode(image):
+        buffer = io.BytesIO()
+
+        # Keep transparency, everything else goes to compact JPEG
+        if image.mode in ("RGBA", "LA") or (
+            image.mode == "P" and "transparency" in image.info
+        ):
+            image.save(buffer, format="PNG")
+        else:
+            image.convert("RGB").save(buffer, format="JPEG", quality=90)
+
+        return buffer.getvalue()
+
+    def commit(self):
+        with self._lock:
+            if not self._closed:
+                self._conn.commit()
+
+    # ---------------------------------------------------------
+    # Maintenance
+    # ---------------------------------------------------------
+
+    def prune(self, root, valid_paths):
+        """
+        Drop entries under root whose image is no longer in valid_paths.
+        """
+        prefix = str(root)
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS valid_paths "
+                "(path TEXT PRIMARY KEY)"
+            )
+            self._conn.execute("DELETE FROM valid_paths")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO valid_paths (path) VALUES (?)",
+                ((str(p),) for p in valid_paths)
+            )
+            self._conn.execute(
+                "DELETE FROM thumbnails "
+                "WHERE substr(path, 1, ?) = ? "
+                "AND path NOT IN (SELECT path FROM valid_paths)",
+                (len(prefix), prefix)
+            )
+            self._conn.execute("DELETE FROM valid_paths")
+            self._conn.commit()
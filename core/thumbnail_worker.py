@@ -0,0 +1,139 @@
+import os
+import threading
+from collections import deque
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+from core import tracing
+from core.image_decode import decode_reduced
+from core.thumbnail_store import ThumbnailStore
+
+
+@tracing.traced("thumbnail.decode")
+def decode_thumbnail(path, thumb_size, store=None):
+    """
+    Produce a thumbnail QImage (safe outside the GUI thread).
+    Disk store first, decode with PIL only when missing or stale.
+    """
+    key = ThumbnailStore.stat_key(path)
+
+    if store and key:
+        data = store.get(path, key)
+        if data is not None:
+            image = QImage.fromData(data)
+            if not image.isNull():
+                return image
+
+    try:
+        img = decode_reduced(path, thumb_size)  # JPEG: DCT-scaled decode
+    except Exception:
+        return None
+
+    if store and key:
+        store.put(path, img, key)
+
+    # Only needed on a store miss: a warm start never imports PIL
+    from PIL.ImageQt import ImageQt
+
+    # Detach from the PIL buffer before crossing threads
+    return ImageQt(img).copy()
+
+
+class ThumbnailPipeline(QObject):
+    """
+    Bounded pool of decoder threads.
+
+    - schedule() replaces the pending queue, in priority order,
+      so the caller puts on-screen rows first
+    - Finished thumbnails are delivered one by one via thumbnail_ready
+      (null QImage when the file could not be decoded)
+    - cancel_pending() drops queued work and discards in-flight results
+    - decode(path) can be swapped out (the preview cache reuses the
+      pool with its own decoder)
+    """
+
+    thumbnail_ready = Signal(str, QImage)
+
+    def __init__(self, thumb_size, max_workers=None, parent=None, decode=None):
+        super().__init__(parent)
+        self.thumb_size = thumb_size
+        self.store = None
+        self.decode = decode or self.decode_thumbnail
+
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._in_flight = set()
+        self._generation = 0
+        self._stopped = False
+
+        if max_workers is None:
+            max_workers = max(2, min(8, (os.cpu_count() or 2) - 1))
+
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True)
+            for _ in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # ---------------------------------------------------------
+    # Public API (GUI thread)
+    # ---------------------------------------------------------
+
+    def set_store(self, store):
+        with self._cond:
+            self.store = store
+
+    def schedule(self, paths):
+        """
+        Replace pending work with paths, highest priority first.
+        """
+        with self._cond:
+            self._queue = deque(
+                p for p in dict.fromkeys(paths)
+                if p not in self._in_flight
+            )
+            self._cond.notify_all()
+
+    def cancel_pending(self):
+        with self._cond:
+            self._queue.clear()
+            self._generation += 1
+
+    def shutdown(self):
+        with self._cond:
+            self._queue.clear()
+            self._stopped = True
+            self._cond.notify_all()
+
+    def decode_thumbnail(self, path):
+        with self._cond:
+            store = self.store
+        return decode_thumbnail(path, self.thumb_size, store)
+
+    # ---------------------------------------------------------
+    # Worker Loop
+    # ---------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+
+                if self._stopped:
+                    return
+
+                path = self._queue.popleft()
+                generation = self._generation
+                self._in_flight.add(path)
+
+            image = self.decode(path)
+
+            with self._cond:
+                self._in_flight.discard(path)
+                stale = generation != self._generation or self._stopped
+
+            if stale:
+                continue
+
+            self.thumbnail_ready.emit(path, image if image is not None else QImage())
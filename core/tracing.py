@@ -0,0 +1,172 @@
+"""
+Always-on span tracing for the hot paths.
+
+    with tracing.span("gallery.apply_filters"):
+        ...
+
+    @tracing.traced("loader.run")
+    def run(self): ...
+
+- A span costs two perf_counter_ns() calls, a lock and a deque
+  append (~1 µs), cheap enough to leave on
+- Finished spans go to a bounded ring buffer (the newest MAX_EVENTS)
+  and into per-name totals that are never dropped
+- export_chrome_trace(path): Chrome trace-event JSON, open it in
+  Perfetto (ui.perfetto.dev) or chrome://tracing
+- summary(): {name: count / total / last / max ms} for the status bar
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+MAX_EVENTS = 100_000    # spans kept for export (oldest dropped first)
+
+_EPOCH_NS = time.perf_counter_ns()
+
+_lock = threading.Lock()
+_events = deque(maxlen=MAX_EVENTS)    # (name, start_ns, dur_ns, tid, args)
+_totals = {}                          # name → [count, total_ns, last_ns, max_ns]
+_thread_names = {}                    # tid → thread name
+
+
+def record(name, start_ns, dur_ns, args=None):
+    """
+    Add a finished span (start_ns from time.perf_counter_ns()).
+    """
+    tid = threading.get_ident()
+
+    with _lock:
+        _events.append((name, start_ns, dur_ns, tid, args))
+
+        totals = _totals.get(name)
+        if totals is None:
+            _totals[name] = [1, dur_ns, dur_ns, dur_ns]
+        else:
+            totals[0] += 1
+            totals[1] += dur_ns
+            totals[2] = dur_ns
+            if dur_ns > totals[3]:
+                totals[3] = dur_ns
+
+        if tid not in _thread_names:
+            _thread_names[tid] = threading.current_thread().name
+
+
+class span:
+    """
+    Context manager timing one phase. args (small, JSON-friendly)
+    show up in the trace viewer; set() adds more before the end.
+    """
+
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, **args):
+        self.name = name
+        self.args = args or None
+
+    def set(self, **args):
+        self.args = {**(self.args or {}), **args}
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+def traced(name):
+    """
+    Decorator: the whole call is one span.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+# ---------------------------------------------------------
+# Reading
+# ---------------------------------------------------------
+
+def summary():
+    """
+    {name: {"count", "total_ms", "last_ms", "avg_ms", "max_ms"}}
+    since start (or reset()).
+    """
+    with _lock:
+        totals = {name: list(values) for name, values in _totals.items()}
+
+    return {
+        name: {
+            "count": count,
+            "total_ms": total / 1e6,
+            "last_ms": last / 1e6,
+            "avg_ms": total / count / 1e6,
+            "max_ms": peak / 1e6,
+        }
+        for name, (count, total, last, peak) in totals.items()
+    }
+
+
+def reset():
+    with _lock:
+        _events.clear()
+        _totals.clear()
+
+
+def chrome_trace():
+    """
+    Trace-event dict: complete ("X") events in µs since startup,
+    plus thread-name metadata so pool threads get readable tracks.
+    """
+    with _lock:
+        events = list(_events)
+        threads = dict(_thread_names)
+
+    pid = os.getpid()
+    trace = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+         "args": {"name": name}}
+        for tid, name in threads.items()
+    ]
+
+    for name, start_ns, dur_ns, tid, args in events:
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start_ns - _EPOCH_NS) / 1000,
+            "dur": dur_ns / 1000,
+            "pid": pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        trace.append(event)
+
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path):
+    """
+    Write the buffered spans as Chrome trace JSON. Returns the
+    number of spans written.
+    """
+    trace = chrome_trace()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f)
+
+    return sum(1 for e in trace["traceEvents"] if e["ph"] == "X")
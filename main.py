@@ -1,12 +1,41 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+from core import startup
+
 
 def main():
+    # Before anything heavy is imported, so the report sees every import
+    sys.argv = startup.configure(sys.argv)
+    quit_after_startup = "--quit-after-startup" in sys.argv
+
+    # Qt and the UI load here, not at module level: spawned worker
+    # processes re-import this file and need none of it
+    from PySide6.QtCore import Qt, QTimer
+    from PySide6.QtWidgets import QApplication
+    startup.mark("Qt imported")
+
+    from ui.main_window import MainWindow
+    startup.mark("UI imported")
+
     app = QApplication(sys.argv)
+    if quit_after_startup:
+        # startup benchmark: stop once the first thumbnail is on screen
+        startup.on_report(lambda: QTimer.singleShot(0, app.quit))
+
     window = MainWindow()
+    startup.mark("window built")
+
+    if quit_after_startup:
+        # The user's first click: include the whole dataset
+        root = window.folder_panel.tree.topLevelItem(0)
+        if root is None:
+            startup.report("no dataset")
+        else:
+            root.setCheckState(0, Qt.Checked)
+
     window.show()
+    startup.mark("window shown")
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
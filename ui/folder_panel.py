@@ -108,14 +108,54 @@ class FolderPanel(QWidget):
         if not parent_item:
             return
 
+        # Already there (e.g. created here, then reported by the watcher)
+        for i in range(parent_item.childCount()):
+            if parent_item.child(i).data(0, Qt.UserRole) == str(folder_path):
+                return
+
         # Create new node
         new_item = QTreeWidgetItem(parent_item)
         new_item.setText(0, folder_path.name)
         new_item.setCheckState(0, Qt.Unchecked)
         new_item.setData(0, Qt.UserRole, str(folder_path))
 
+        # Moved-in folders can bring their own subfolders
+        self.add_children(new_item, folder_path)
+
         parent_item.setExpanded(True)
 
+    def remove_folder_from_tree(self, folder_path):
+        """
+        Remove a folder node (and its children) without rebuilding.
+        """
+
+        folder_path = str(Path(folder_path))
+
+        def find_item(item):
+            if item.data(0, Qt.UserRole) == folder_path:
+                return item
+
+            for i in range(item.childCount()):
+                result = find_item(item.child(i))
+                if result:
+                    return result
+
+            return None
+
+        root = self.tree.topLevelItem(0)
+        if not root:
+            return
+
+        item = find_item(root)
+        if not item or item is root:
+            return
+
+        was_checked = item.checkState(0) == Qt.Checked
+        item.parent().removeChild(item)
+
+        if was_checked:
+            self.emit_selected_folders()
+
     def filter_tree(self, text):
         text = text.lower()
 
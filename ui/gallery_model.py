@@ -0,0 +1,246 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QApplication
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt
+import numpy as np
+
+from core import startup, tracing
+
+from ui.thumbnail_overlays import RatingOverlay
+
+
+PATH_ROLE = Qt.UserRole
+RATING_ROLE = Qt.UserRole + 1
+
+
+class ImageListModel(QAbstractListModel):
+    """
+    Thin list model over the gallery's ImageTable.
+
+    - rows is a NumPy array of table row ids, in display order
+    - positions is the inverse (table row → view row, -1 if hidden),
+      so both directions are O(1)
+    - Thumbnails are requested from the provider only when
+      the view asks for a row (i.e. when it is painted)
+    """
+
+    MAX_DIFF_RUNS = 256  # more insert/remove runs than this → reset
+
+    def __init__(self, table, thumbnail_provider, parent=None):
+        super().__init__(parent)
+        self.table = table
+        self.rows = np.empty(0, dtype=np.int64)
+        self.positions = np.empty(0, dtype=np.int64)
+        self.thumbnail_provider = thumbnail_provider
+
+    def set_table(self, table):
+        self.beginResetModel()
+        self.table = table
+        self.rows = np.empty(0, dtype=np.int64)
+        self.rebuild_positions()
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.rebuild_positions()
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        if len(rows) == 0:
+            return
+
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows = np.concatenate((self.rows, rows))
+        self.rebuild_positions(first)
+        self.endInsertRows()
+
+    def remove_rows(self, positions):
+        """
+        positions: ascending view rows, removed as contiguous runs
+        from the bottom up so earlier rows keep their position.
+        Too fragmented (e.g. thousands of scattered deletes) → one
+        reset instead; returns True in that case.
+        """
+        runs = self.runs(positions)
+
+        if len(runs) > self.MAX_DIFF_RUNS:
+            self.set_rows(np.delete(self.rows, positions))
+            return True
+
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self.positions[self.rows[first:last + 1]] = -1
+            self.rows = np.delete(self.rows, np.s_[first:last + 1])
+            self.endRemoveRows()
+
+        if runs:
+            self.rebuild_positions(runs[0][0])
+
+        return False
+
+    @tracing.traced("gallery.update_rows")
+    def update_rows(self, new_rows):
+        """
+        Move to new_rows with minimal remove/insert signals.
+
+        Rows kept on both sides must be in the same relative order
+        (same filter order / sort key); otherwise, or when the diff is
+        too fragmented to be worth it, fall back to a reset.
+        Returns True when it reset.
+        """
+        new_rows = np.asarray(new_rows, dtype=np.int64)
+
+        kept = np.isin(self.rows, new_rows)
+        added = ~np.isin(new_rows, self.rows)
+
+        if not np.array_equal(self.rows[kept], new_rows[~added]):
+            self.set_rows(new_rows)
+            return True
+
+        removed_positions = np.flatnonzero(~kept)
+        insert_runs = self.runs(np.flatnonzero(added))
+
+        if len(insert_runs) + len(self.runs(removed_positions)) > self.MAX_DIFF_RUNS:
+            self.set_rows(new_rows)
+            return True
+
+        self.remove_rows(removed_positions)
+
+        # Left to right: rows[:first] already equals new_rows[:first]
+        for first, last in insert_runs:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.rows = np.concatenate((
+                self.rows[:first], new_rows[first:last + 1], self.rows[first:]
+            ))
+            self.endInsertRows()
+
+        if insert_runs:
+            self.rebuild_positions(insert_runs[0][0])
+
+        return False
+
+    def rows_changed(self, rows):
+        """
+        Repaint the given table rows (ratings etc. changed).
+        """
+        positions = sorted(
+            p for p in map(self.position, rows) if p is not None
+        )
+        for first, last in self.runs(positions):
+            self.dataChanged.emit(self.index(first), self.index(last))
+
+    @staticmethod
+    def runs(positions):
+        """
+        Ascending positions → [[first, last], ...] contiguous runs.
+        """
+        runs = []
+        for position in map(int, positions):  # Qt wants Python ints
+            if runs and runs[-1][1] == position - 1:
+                runs[-1][1] = position
+            else:
+                runs.append([position, position])
+        return runs
+
+    def rebuild_positions(self, start=0):
+        """
+        Refresh the inverse index from view row start onwards.
+        """
+        size = max(len(self.table), 1)
+        if len(self.positions) < size:
+            grown = np.full(size * 2, -1, dtype=np.int64)
+            grown[:len(self.positions)] = self.positions
+            self.positions = grown
+
+        if start == 0:
+            self.positions.fill(-1)
+
+        self.positions[self.rows[start:]] = np.arange(
+            start, len(self.rows), dtype=np.int64
+        )
+
+    def position(self, row):
+        """
+        View row of a table row, or None when it is filtered out.
+        """
+        if row >= len(self.positions) or self.positions[row] < 0:
+            return None
+        return int(self.positions[row])
+
+    def path(self, position):
+        return self.table.paths[self.rows[position]]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self.rows[index.row()]
+
+        if role == Qt.DecorationRole:
+            return self.thumbnail_provider(index.row())
+        if role == PATH_ROLE:
+            return self.table.paths[row]
+        if role == RATING_ROLE:
+            return int(self.table.rating[row])
+        if role == Qt.ToolTipRole:
+            return self.table.name(row)
+
+        return None
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """
+    Paints the thumbnail and its overlays straight onto the view.
+    Fixed size hint, so layout never has to decode anything.
+
+    - The cached pixmap is drawn as-is (shared, never copied)
+    - Overlays (rating, badges) are painted on top from the table row
+    """
+
+    def __init__(self, thumb_size, parent=None):
+        super().__init__(parent)
+        self.thumb_size = thumb_size
+        self.overlays = [RatingOverlay()]
+
+    def set_overlays(self, overlays):
+        self.overlays = list(overlays)
+
+    def sizeHint(self, option, index):
+        return QSize(self.thumb_size + 20, self.thumb_size + 20)
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+
+        # Selection / hover background
+        style.drawPrimitive(
+            QStyle.PE_PanelItemViewItem, option, painter, widget
+        )
+
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is None or pixmap.isNull():
+            return
+
+        rect = option.rect
+        x = rect.x() + (rect.width() - pixmap.width()) // 2
+        y = rect.y() + (rect.height() - pixmap.height()) // 2
+
+        painter.drawPixmap(x, y, pixmap)
+        startup.report("first thumbnail painted")  # no-op unless measuring
+
+        if not self.overlays:
+            return
+
+        model = index.model()
+        row = model.rows[index.row()]
+        target = QRect(x, y, pixmap.width(), pixmap.height())
+
+        painter.save()
+        for overlay in self.overlays:
+            overlay.paint(painter, target, model.table, row)
+        painter.restore()
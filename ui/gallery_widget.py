@@ -1,49 +1,125 @@
 from PySide6.QtWidgets import (
-    QWidget, QListWidget, QListWidgetItem,
+    QWidget, QListView, QAbstractItemView,
     QVBoxLayout
 )
-from PySide6.QtCore import Signal, QSize, Qt
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtCore import Signal, QPoint, QSize, QTimer
+from PySide6.QtGui import QPixmap
 from pathlib import Path
-from PIL import Image
-from PIL.ImageQt import ImageQt
+import os
+import numpy as np
+from core.byte_lru import ByteLRU
+from core.dataset_index import DatasetIndex
+from core.file_mover import move_files, plan_moves, trash_files
+from core.file_worker import FileWorker
+from core.folder_watcher import FolderWatcher
+from core.image_loader import build_record, list_directory, load_records
+from core.image_probe import probe_dimensions
+from core.image_metrics import METRICS
+from core.image_table import FLAG_DUPLICATE, ImageTable
 from core.loader_worker import ImageLoaderWorker
 from core.metadata_manager import MetadataManager
+from core import startup, tracing
+from core.thumbnail_store import ThumbnailStore
+from core.thumbnail_worker import ThumbnailPipeline
+from ui.gallery_model import ImageListModel, ThumbnailDelegate
+from ui.thumbnail_overlays import FlagBadge, RatingOverlay, ResolutionBadge
+
+PREFETCH_RADIUS = 3  # previews decoded ahead on each side
+
+# Sort mode → (metric column, descending)
+METRIC_SORTS = {
+    f"{name.title()} {label}": (name, descending)
+    for name in METRICS
+    for label, descending in (("High → Low", True), ("Low → High", False))
+}
+
 
 class GalleryWidget(QWidget):
     image_selected = Signal(object)
+    directories_added = Signal(list)
+    directories_removed = Signal(list)
+    images_changed = Signal(list)   # paths replaced in place on disk
+    duplicates_progress = Signal(int, int)
+    duplicates_found = Signal(int)
+    metrics_progress = Signal(int, int)
+    metrics_finished = Signal()
+    file_progress = Signal(int, int)
+    files_finished = Signal(str, int, list)     # "move" / "delete", files done, [(path, error)]
 
     def __init__(self):
         super().__init__()
 
         self.root_path = None
-        self.images_data = []
-        self.filtered_data = []
+        self.table = ImageTable()   # columnar records, see core/image_table.py
 
         self.selected_folders = None
         self.rating_filter = None
         self.size_range = None
         self.min_width = None
         self.min_height = None
+        self.sort_mode = None
+        self.duplicates_only = False
+        self.duplicate_worker = None
+        self.metric_ranges = {}     # metric → (min, max)
+        self.metrics_worker = None
+        self.file_worker = None     # background move / delete
 
-        self.thumbnail_cache = {}   # 🔥 cache added
+        # 🔥 cache added: memory-bounded, on-screen rows never evicted
+        self.thumbnail_cache = ByteLRU(512 * 1024 * 1024, keep=self.near_viewport)
+        self.prefetch_window = (0, -1)  # view rows last scheduled
+        self.thumb_store = None     # disk cache, survives reloads
+        self.failed_thumbnails = set()
 
         self.thumb_size = 260
 
-        self.list_widget = QListWidget()
-        self.list_widget.setViewMode(QListWidget.IconMode)
-        self.list_widget.setMovement(QListWidget.Static)
-        self.list_widget.setResizeMode(QListWidget.Adjust)
-        self.list_widget.setSpacing(16)
-        self.list_widget.setIconSize(QSize(self.thumb_size, self.thumb_size))
-        self.list_widget.setGridSize(QSize(self.thumb_size + 30, self.thumb_size + 40))
-        self.list_widget.setWrapping(True)
+        # Background decoders, results arrive one by one
+        self.thumb_pipeline = ThumbnailPipeline(self.thumb_size, parent=self)
+        self.thumb_pipeline.thumbnail_ready.connect(self.on_thumbnail_ready)
+
+        # Disk changes are applied incrementally, no full reload
+        self.folder_watcher = FolderWatcher(self)
+        self.folder_watcher.directories_changed.connect(self.sync_directories)
+
+        # Rows painted without a thumbnail since the last schedule
+        self.missed_rows = set()
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.setInterval(0)
+        self.schedule_timer.timeout.connect(self.schedule_thumbnails)
 
-        self.list_widget.itemClicked.connect(self.on_item_clicked)
-        self.list_widget.setSelectionMode(QListWidget.ExtendedSelection)
+        # Batch disk-store writes instead of committing per thumbnail
+        self.store_commit_timer = QTimer(self)
+        self.store_commit_timer.setSingleShot(True)
+        self.store_commit_timer.setInterval(1000)
+        self.store_commit_timer.timeout.connect(self.commit_thumb_store)
+
+        # Model/view: only rows the view actually paints get decoded
+        self.model = ImageListModel(self.table, self.get_thumbnail, self)
+        self.delegate = ThumbnailDelegate(self.thumb_size, self)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setViewMode(QListView.IconMode)
+        self.list_view.setMovement(QListView.Static)
+        self.list_view.setResizeMode(QListView.Adjust)
+        self.list_view.setSpacing(16)
+        self.list_view.setIconSize(QSize(self.thumb_size, self.thumb_size))
+        self.list_view.setGridSize(QSize(self.thumb_size + 30, self.thumb_size + 40))
+        self.list_view.setWrapping(True)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(500)
+
+        # Mouse and keyboard both move the current index (a click sets
+        # it on press), so it alone drives the preview
+        self.list_view.selectionModel().currentChanged.connect(
+            self.on_current_changed
+        )
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
 
         layout = QVBoxLayout()
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.list_view)
         self.setLayout(layout)
 
     # -----------------------------
@@ -57,51 +133,604 @@ class GalleryWidget(QWidget):
         resets image data,
         and initializes metadata manager.
         """
+        # Finished moves / deletes still belong to the current dataset
+        self.stop_file_operation()
+
         self.root_path = Path(folder_path)
 
         # --- Stop previous worker safely ---
         if hasattr(self, "worker") and self.worker.isRunning():
-            self.worker.quit()
+            self.worker.requestInterruption()
             self.worker.wait()
 
+        self.stop_duplicate_search()
+        self.stop_metrics()
+
         # --- Initialize metadata manager ---
         from core.settings_manager import SettingsManager
 
         settings = SettingsManager()
         dataset_base = settings.get_dataset_base_path()
 
-        self.metadata = MetadataManager(folder_path, dataset_base)
+        if hasattr(self, "metadata"):
+            self.metadata.close()  # flush pending ratings
+
+        self.metadata = MetadataManager(
+            folder_path, dataset_base, settings.get_metadata_backend()
+        )
+        self.configure_overlays(settings)
+        self.thumbnail_cache.set_max_bytes(
+            settings.get_thumbnail_cache_mb() * 1024 * 1024
+        )
+
+        # --- Open persistent thumbnail store ---
+        self.thumb_pipeline.cancel_pending()
+
+        if self.thumb_store:
+            self.thumb_store.close()
+
+        self.thumb_store = ThumbnailStore(
+            self.metadata.resolve_store_file("thumbnails.db"),
+            self.thumb_size
+        )
+        self.thumb_pipeline.set_store(self.thumb_store)
 
         # --- Reset state ---
-        self.images_data = []
-        self.filtered_data = []
+        self.missed_rows.clear()
+        self.table = ImageTable()
+        self.model.set_table(self.table)
         self.thumbnail_cache.clear()
-        self.display_images([])
+        self.failed_thumbnails.clear()
+
+        self.folder_watcher.watch_tree(folder_path)
+
+        # Events while loading (our own store files in the root, new
+        # files) wait until the loader is done: syncing a directory
+        # now would add files the loader is about to send again
+        self.folder_watcher.hold()
 
         # --- Start background loader ---
-        self.worker = ImageLoaderWorker(folder_path)
+        self.worker = ImageLoaderWorker(
+            folder_path,
+            self.metadata.resolve_store_file("index.db")
+        )
+        self.worker.batch_loaded.connect(self.on_batch_loaded)
         self.worker.finished_loading.connect(self.on_loading_finished)
         self.worker.start()
 
-    def on_loading_finished(self, images_data):
-        self.images_data = images_data
+    def configure_overlays(self, settings):
+        """
+        Pick the overlays the delegate paints on every thumbnail.
+        """
+        overlays = [RatingOverlay(), FlagBadge(FLAG_DUPLICATE, "DUP")]
+
+        if settings.get_show_resolution_badge():
+            overlays.append(ResolutionBadge())
+
+        self.delegate.set_overlays(overlays)
+
+    def relative_path(self, path):
+        return str(Path(path).relative_to(self.root_path)).replace("\\", "/")
+
+    @tracing.traced("gallery.join_ratings")
+    def join_ratings(self, records):
+        relative = [self.relative_path(img["path"]) for img in records]
+        ratings = self.metadata.get_ratings(relative)
+
+        for img, relative_path in zip(records, relative):
+            img["rating"] = ratings[relative_path]
+
+    def on_batch_loaded(self, batch):
+        """
+        Records stream in while the worker is still scanning.
+        Matching rows are appended to the view right away, also in
+        a sorted view: re-sorting every batch is O(n²) over a load,
+        the order is applied once in on_loading_finished.
+        """
+        if self.sender() is not self.worker:
+            return  # late batch from a previous load
+
+        # A move during the load may already have put the file in
+        # place under this path (a stale source is synced away once
+        # the watcher is released)
+        path_index = self.table.path_index
+        batch = [img for img in batch if img["path"] not in path_index]
 
         # Load saved ratings
-        for img in self.images_data:
-            relative_path = str(
-                Path(img["path"]).relative_to(self.root_path)
-            ).replace("\\", "/")
+        self.join_ratings(batch)
 
-            img["rating"] = self.metadata.get_rating(relative_path)
+        rows = self.table.extend(batch)
+        self.model.append_rows(self.filter_rows(rows))
+        startup.mark("first images listed")
 
-         # Clean invalid rating entries
-        valid_paths = [
-            str(Path(img["path"]).relative_to(self.root_path)).replace("\\", "/")
-            for img in self.images_data
-        ]
-        self.metadata.clean_orphan_entries(valid_paths)
-        
+    @tracing.traced("gallery.loading_finished")
+    def on_loading_finished(self):
+        if self.sender() is not self.worker:
+            return
+
+        self.folder_watcher.release()
+
+        # Streamed batches were appended unsorted
+        if self.sort_mode is not None:
+            self.display_images(self.sort_rows(self.filter_rows()))
+
+        live_paths = [self.table.paths[row] for row in self.table.live_rows()]
+
+        startup.mark("dataset scanned")
+        if not live_paths:
+            startup.report("nothing to paint")
+
+        # Clean invalid rating entries
+        valid_paths = [self.relative_path(path) for path in live_paths]
+        with tracing.span("gallery.clean_orphans", images=len(valid_paths)):
+            self.metadata.clean_orphan_entries(valid_paths)
+        with tracing.span("gallery.prune_thumbnails"):
+            self.thumb_store.prune(self.root_path, live_paths)
+
+        # Metrics measured in earlier sessions (if any)
+        self.start_metrics(cached_only=True)
+
+    def shutdown(self):
+        """
+        Stop background work and flush pending metadata (app exit).
+        """
+        if hasattr(self, "worker") and self.worker.isRunning():
+            self.worker.requestInterruption()
+            self.worker.wait()
+
+        self.stop_file_operation()
+        self.stop_duplicate_search()
+        self.stop_metrics()
+        self.thumb_pipeline.shutdown()
+
+        if hasattr(self, "metadata"):
+            self.metadata.close()
+
+        if self.thumb_store:
+            self.thumb_store.close()
+
+    # -----------------------------
+    # Incremental Updates
+    # -----------------------------
+
+    def sync_directories(self, directories):
+        """
+        Bring the loaded image set in line with what is on disk
+        for the given directories only (watcher events, moves, deletes).
+
+        - Files on both sides are checked against the index
+          (size + mtime): replaced files get new dimensions and
+          their thumbnail / preview is dropped
+        - A vanished and a new file with the same size + mtime
+          are an external rename: the row (and rating) moves along
+        """
+        if not self.root_path:
+            return
+
+        root = str(self.root_path)
+        table = self.table
+        watched = self.folder_watcher.directories()
+        removed_rows = []
+        added_paths = []
+        kept_paths = []
+        new_dirs = []
+        gone_dirs = []
+
+        for directory in directories:
+            directory = os.path.normpath(str(directory))
+
+            if directory != root and not directory.startswith(root + os.sep):
+                continue  # e.g. move destination outside the dataset
+
+            if not os.path.isdir(directory):
+                gone_dirs.append(directory)
+                continue
+
+            files, subdirs = list_directory(directory)
+            on_disk = set(files)
+
+            folder_id = table.folder_ids.get(directory)
+            current = {}
+            if folder_id is not None:
+                current = {
+                    table.paths[row]: row
+                    for row in table.rows_in_folders([folder_id])
+                }
+
+            removed_rows += [
+                row for path, row in current.items() if path not in on_disk
+            ]
+            added_paths += [p for p in files if p not in current]
+            kept_paths += [p for p in files if p in current]
+
+            subdirs = set(subdirs)
+            new_dirs += [d for d in subdirs if d not in watched]
+            gone_dirs += [
+                d for d in watched
+                if os.path.dirname(d) == directory and d not in subdirs
+            ]
+
+        # Vanished (deleted / renamed away) subtrees
+        for directory in gone_dirs:
+            prefix = directory + os.sep
+            folder_ids = [
+                folder_id for folder_id, folder in enumerate(table.folders)
+                if folder == directory or folder.startswith(prefix)
+            ]
+            removed_rows += table.rows_in_folders(folder_ids).tolist()
+            self.folder_watcher.remove_tree(directory)
+
+        index_path = self.metadata.resolve_store_file("index.db")
+        with DatasetIndex.open_in_thread(index_path) as index:
+            # New files, then whole new subtrees
+            new_records = []
+            new_keys = {}   # path → (size, mtime_ns)
+            for path in added_paths:
+                try:
+                    st = os.stat(path)
+                    width, height = probe_dimensions(path)
+                except Exception:
+                    continue
+                new_keys[path] = (st.st_size, st.st_mtime_ns)
+                new_records.append(build_record(path, width, height))
+
+            for directory in new_dirs:
+                records = list(load_records(directory, index))
+                new_keys.update(
+                    (path, entry[:2])
+                    for path, entry in index.lookup(
+                        img["path"] for img in records
+                    ).items()
+                )
+                new_records += records
+                self.folder_watcher.add_tree(directory)
+
+            # Watch list may still be filling up → skip already loaded paths
+            new_records = [
+                img for img in new_records
+                if table.row_for_path(img["path"]) is None
+            ]
+
+            changed = self.changed_files(index, kept_paths)
+            moves = self.match_renames(
+                index, [table.paths[row] for row in removed_rows], new_keys
+            )
+
+            index.upsert(
+                (img["path"], *new_keys[img["path"]], img["width"], img["height"])
+                for img in new_records if img["path"] in new_keys
+            )
+
+        # Renamed files keep their row: drop them from both sides
+        if moves:
+            removed_rows = [
+                row for row in removed_rows if table.paths[row] not in moves
+            ]
+            renamed = set(moves.values())
+            new_records = [
+                img for img in new_records if img["path"] not in renamed
+            ]
+            self.apply_moves(list(moves.items()))
+
+        self.join_ratings(new_records)
+
+        self.remove_rows(removed_rows)
+        self.add_records(new_records)
+        self.apply_changes(changed)
+
+        if gone_dirs:
+            self.directories_removed.emit(gone_dirs)
+        if new_dirs:
+            self.directories_added.emit(sorted(new_dirs))
+
+    def changed_files(self, index, paths):
+        """
+        {path: (width, height)} of loaded files whose size or mtime no
+        longer matches the index (replaced in place). The index is
+        updated with the re-probed entries.
+        """
+        known = index.lookup(paths)
+        changed = {}
+        updates = []
+
+        for path in paths:
+            try:
+                st = os.stat(path)
+                entry = known.get(path)
+                if entry and entry[:2] == (st.st_size, st.st_mtime_ns):
+                    continue
+                width, height = probe_dimensions(path)
+            except Exception:
+                continue
+
+            changed[path] = (width, height)
+            updates.append((path, st.st_size, st.st_mtime_ns, width, height))
+
+        index.upsert(updates)
+        return changed
+
+    def match_renames(self, index, removed_paths, new_keys):
+        """
+        {old path: new path} for vanished files whose size + mtime
+        match exactly one new file (and vice versa).
+        """
+        def by_key(items):
+            groups = {}
+            for path, key in items:
+                groups.setdefault(key, []).append(path)
+            return groups
+
+        old = by_key(
+            (path, entry[:2])
+            for path, entry in index.lookup(removed_paths).items()
+        )
+        new = by_key(new_keys.items())
+
+        return {
+            paths[0]: new[key][0]
+            for key, paths in old.items()
+            if len(paths) == 1 and len(new.get(key, ())) == 1
+        }
+
+    def apply_changes(self, changed):
+        """
+        Show new dimensions of files replaced in place and drop their
+        cached thumbnails (memory, disk) and previews.
+        """
+        if not changed:
+            return
+
+        rows = self.table.update_files(changed)
+
+        for path in changed:
+            self.thumbnail_cache.discard(path)
+            self.failed_thumbnails.discard(path)
+
+        if self.thumb_store:
+            self.thumb_store.remove(changed)
+
+        # Size filter / order may have changed: diff, no reset
+        self.apply_filters()
+        self.model.rows_changed(rows)
+        self.images_changed.emit(list(changed))
+
+    def add_records(self, records):
+        if not records:
+            return
+
+        self.show_new_rows(self.table.extend(records))
+
+    def show_new_rows(self, rows):
+        """
+        Unsorted view: append matching rows. Sorted: diff into place.
+        """
+        if self.sort_mode is None:
+            self.model.append_rows(self.filter_rows(rows))
+        else:
+            self.apply_filters()
+
+    def remove_rows(self, rows):
+        """
+        rows: table row ids to drop from the table and the view.
+        """
+        if len(rows) == 0:
+            return
+
+        rows = np.asarray(rows, dtype=np.int64)
+        positions = sorted(
+            p for p in map(self.model.position, rows) if p is not None
+        )
+        anchor = self.scroll_anchor(positions)
+
+        self.table.remove(rows)
+        if self.model.remove_rows(positions):
+            # Fragmented removal → reset
+            self.forget_positions()
+            self.restore_scroll(anchor)
+
+        for row in rows:
+            path = self.table.paths[row]
+            self.thumbnail_cache.discard(path)
+            self.failed_thumbnails.discard(path)
+
+    def scroll_anchor(self, removed_positions):
+        """
+        Table row of the first image on screen that survives the
+        removal of removed_positions (None: nothing to keep in view).
+        """
+        x = self.list_view.spacing() + self.thumb_size // 2
+        for y in (self.list_view.spacing(), self.list_view.gridSize().height() // 2):
+            index = self.list_view.indexAt(QPoint(x, y))
+            if index.isValid():
+                break
+        else:
+            return None
+
+        removed = set(removed_positions)
+        for position in range(index.row(), self.model.rowCount()):
+            if position not in removed:
+                return int(self.model.rows[position])
+        return None
+
+    def restore_scroll(self, anchor):
+        position = self.model.position(anchor) if anchor is not None else None
+        if position is None:
+            return
+
+        # A batched layout is not far enough yet to scroll to the
+        # anchor; uniform sizes make one full pass cheap (~0.1 s / 500k)
+        self.list_view.setLayoutMode(QListView.SinglePass)
+        self.list_view.doItemsLayout()
+        self.list_view.scrollTo(
+            self.model.index(position), QAbstractItemView.PositionAtTop
+        )
+        self.list_view.setLayoutMode(QListView.Batched)
+
+    # -----------------------------
+    # File Operations
+    # -----------------------------
+
+    def move_paths(self, paths, dest_folder):
+        """
+        Move images into dest_folder in the background.
+        Returns False while another file operation is running.
+        """
+        return self.start_file_operation(
+            "move",
+            lambda progress, cancelled: move_files(
+                plan_moves(paths, dest_folder), progress, cancelled
+            )
+        )
+
+    def delete_paths(self, paths):
+        """
+        Send images to the recycle bin in the background.
+        Returns False while another file operation is running.
+        """
+        return self.start_file_operation(
+            "delete",
+            lambda progress, cancelled: trash_files(paths, progress, cancelled)
+        )
+
+    def start_file_operation(self, name, operation):
+        if self.file_worker and self.file_worker.isRunning():
+            return False
+
+        # Our own changes are applied directly, the watcher would
+        # otherwise re-probe (and lose the ratings of) every file
+        self.folder_watcher.hold()
+
+        self.file_worker = FileWorker(name, operation)
+        self.file_worker.progress.connect(self.file_progress)
+        self.file_worker.finished_files.connect(self.on_file_operation_finished)
+        self.file_worker.start()
+        return True
+
+    def cancel_file_operation(self):
+        if self.file_worker:
+            self.file_worker.requestInterruption()
+
+    def stop_file_operation(self):
+        """
+        Wait for a running move / delete and apply what it did
+        (dataset switch, exit): moved files must not lose their ratings.
+        """
+        worker = self.file_worker
+        if worker is None or worker.applied:
+            return
+
+        worker.requestInterruption()
+        worker.wait()
+        self.finish_file_operation(worker)
+
+    def on_file_operation_finished(self, done, failed):
+        worker = self.sender()
+        if worker is self.file_worker and not worker.applied:
+            self.finish_file_operation(worker)
+
+    def finish_file_operation(self, worker):
+        # The worker object stays referenced: run() may still be returning
+        worker.applied = True
+
+        if worker.name == "move":
+            self.apply_moves(worker.done)
+        else:
+            self.apply_deletes(worker.done)
+
+        self.folder_watcher.release()
+        self.files_finished.emit(worker.name, len(worker.done), worker.failed)
+
+    @tracing.traced("gallery.apply_moves")
+    def apply_moves(self, moved):
+        """
+        Update the loaded set for moved files without a rescan:
+        table rows are renamed in place (rating, metrics and flags
+        stay), rating keys are rewritten in one batch and thumbnails
+        are re-keyed. Images moved out of the dataset are removed.
+        """
+        if not moved:
+            return
+
+        root = str(self.root_path)
+        inside = {
+            src: dst for src, dst in moved
+            if dst.startswith(root + os.sep)
+        }
+        outside = [src for src, _ in moved if src not in inside]
+
+        self.metadata.move_entries({
+            self.relative_path(src):
+                self.relative_path(inside[src]) if src in inside else None
+            for src, _ in moved
+        })
+
+        renamed = self.table.rename(inside)
+
+        for src, dst in inside.items():
+            self.thumbnail_cache.rename(src, dst)
+            if src in self.failed_thumbnails:
+                self.failed_thumbnails.discard(src)
+                self.failed_thumbnails.add(dst)
+
+        if self.thumb_store:
+            self.thumb_store.rename(inside)
+
+        self.rename_store_entries(inside)
+
+        self.remove_rows([
+            row for row in map(self.table.row_for_path, outside)
+            if row is not None
+        ])
+
+        # Folder filter / name order may have changed: diff, no reset
         self.apply_filters()
+        self.model.rows_changed(renamed)
+
+    def rename_store_entries(self, moves):
+        """
+        Re-key the path-keyed stores (index, metrics, hashes), so a
+        later load does not re-probe or re-measure moved files.
+        """
+        from core.dataset_index import DatasetIndex
+        from core.hash_store import HashStore
+        from core.metrics_store import MetricsStore
+
+        for store_class, name in (
+            (DatasetIndex, "index.db"),
+            (MetricsStore, "metrics.db"),
+            (HashStore, "hashes.db"),
+        ):
+            path = self.metadata.resolve_store_file(name)
+            if not path.exists():
+                continue
+
+            store = store_class(path)
+            try:
+                store.rename(moves)
+            finally:
+                store.close()
+
+    @tracing.traced("gallery.apply_deletes")
+    def apply_deletes(self, deleted):
+        """
+        Drop deleted images without a rescan: their rows leave the
+        table and the view (other thumbnails and the scroll position
+        stay), rating entries and stored thumbnails go in one batch.
+        """
+        if not deleted:
+            return
+
+        self.metadata.remove_entries(
+            [self.relative_path(path) for path in deleted]
+        )
+
+        if self.thumb_store:
+            self.thumb_store.remove(deleted)
+
+        self.remove_rows([
+            row for row in map(self.table.row_for_path, deleted)
+            if row is not None
+        ])
 
     # -----------------------------
     # Filtering
@@ -123,115 +752,183 @@ class GalleryWidget(QWidget):
         self.size_range = None
         self.apply_filters()
 
+    @property
+    def filtered_rows(self):
+        return self.model.rows
+
+    @tracing.traced("gallery.apply_filters")
     def apply_filters(self):
-        data = self.images_data
-
-        # Folder filter
-        if self.selected_folders is not None:
-            if len(self.selected_folders) == 0:
-                data = []  # user unchecked all → show nothing
-            else:
-                data = [
-                    img for img in data
-                    if img["folder"] in self.selected_folders
-                ]
-
-        # Size range filter (based on max dimension)
-        if self.size_range:
-            min_val, max_val = self.size_range
-            data = [
-                img for img in data
-                if min_val <= max(img["width"], img["height"]) <= max_val
-            ]
+        """
+        Recompute the visible rows and apply only the difference
+        (scroll position and selection survive).
+        """
+        if self.model.update_rows(self.sort_rows(self.filter_rows())):
+            self.forget_positions()
 
-        # Minimum width/height filter
-        if self.min_width and self.min_height:
-            data = [
-                img for img in data
-                if img["width"] >= self.min_width
-                and img["height"] >= self.min_height
-            ]
+    def refresh_rows(self, rows):
+        """
+        Re-check a few changed rows against the filters.
+        Cost depends on len(rows) only, not on the dataset size.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        visible = self.filter_rows(rows)
+        hidden = np.setdiff1d(rows, visible)
 
-        # Rating filter
-        if self.rating_filter is not None:
-            data = [
-                img for img in data
-                if img.get("rating", 0) in self.rating_filter
-            ]
+        if self.model.remove_rows(sorted(
+            p for p in map(self.model.position, hidden) if p is not None
+        )):
+            self.forget_positions()
+        self.model.rows_changed(visible)
+
+    @tracing.traced("gallery.filter_rows")
+    def filter_rows(self, rows=None):
+        """
+        Table rows (all live rows by default) passing the current
+        filters, as one vectorized mask per filter.
+        An empty folder selection (user unchecked all) shows nothing.
+        """
+        min_size = None
+        if self.min_width and self.min_height:
+            min_size = (self.min_width, self.min_height)
 
-        self.filtered_data = data
-        self.display_images(self.filtered_data)
+        return self.table.select(
+            rows,
+            folders=self.selected_folders,
+            size_range=self.size_range,
+            min_size=min_size,
+            ratings=self.rating_filter,
+            flags=FLAG_DUPLICATE if self.duplicates_only else None,
+            metric_ranges=self.metric_ranges
+        )
 
     # -----------------------------
     # Display (with cache)
     # -----------------------------
 
-    def display_images(self, images):
-        self.list_widget.clear()
+    @tracing.traced("gallery.display_images")
+    def display_images(self, rows):
+        self.forget_positions()
+        self.model.set_rows(rows)
 
-        for data in images:
-            path = data["path"]
+    def forget_positions(self):
+        """
+        The view was reset: queued decodes, missed rows and the
+        prefetch window belong to the previous row positions.
+        """
+        self.thumb_pipeline.cancel_pending()
+        self.missed_rows.clear()
+        self.prefetch_window = (0, -1)
 
-            if path in self.thumbnail_cache:
-                pixmap = self.thumbnail_cache[path]
-            else:
-                try:
-                    img = Image.open(path)
-                    img.thumbnail((self.thumb_size, self.thumb_size))
-                    qt_image = ImageQt(img)
-                    pixmap = QPixmap.fromImage(qt_image)
-                    self.thumbnail_cache[path] = pixmap
-                except:
-                    continue
+    def get_thumbnail(self, row):
+        """
+        Called by the model for painted rows only.
+        Misses are queued for the background pipeline.
+        """
+        path = self.model.path(row)
+
+        pixmap = self.thumbnail_cache.get(path)
+        if pixmap is None and path not in self.failed_thumbnails:
+            self.missed_rows.add(row)
+            self.schedule_timer.start()
+
+        return pixmap
+
+    def schedule_thumbnails(self):
+        """
+        Visible misses first, then one screen ahead and one behind.
+        """
+        if not self.missed_rows:
+            return
+
+        visible = sorted(self.missed_rows)
+        self.missed_rows.clear()
+
+        first, last = visible[0], visible[-1]
+        margin = self.rows_per_screen()
+        count = self.model.rowCount()
+
+        rows = visible
+        rows += range(last + 1, min(count, last + 1 + margin))
+        rows += range(first - 1, max(-1, first - 1 - margin), -1)
+
+        self.prefetch_window = (first - margin, last + margin)
+
+        paths = []
+        for row in rows:
+            if row >= count:
+                continue
+            path = self.model.path(row)
+            if path not in self.thumbnail_cache and path not in self.failed_thumbnails:
+                paths.append(path)
 
-            # draw rating overlay
-            rating = data.get("rating", 0)
+        self.thumb_pipeline.schedule(paths)
 
-            if rating > 0:
-                from PySide6.QtGui import QPainter, QColor, QFont
+    def rows_per_screen(self):
+        """
+        Thumbnails one viewport shows: grid lines that fit (plus the
+        partly visible one) times columns.
+        """
+        grid = self.list_view.gridSize()
+        viewport = self.list_view.viewport()
+
+        columns = max(1, viewport.width() // grid.width())
+        lines = -(-viewport.height() // grid.height()) + 1
 
-                pix = QPixmap(pixmap)
-                painter = QPainter(pix)
-                painter.setPen(QColor("yellow"))
-                painter.setFont(QFont("Arial", 20, QFont.Bold))
-                painter.drawText(10, 30, f"{rating}★")
-                painter.end()
+        return columns * lines
+
+    def on_thumbnail_ready(self, path, image):
+        if image.isNull():
+            self.failed_thumbnails.add(path)
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self.thumbnail_cache.put(
+            path, pixmap, pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        )
+        self.store_commit_timer.start()
+        self.list_view.viewport().update()
+
+    def near_viewport(self, path):
+        """
+        Eviction guard: keep thumbnails on screen or one screen around it.
+        """
+        row = self.table.row_for_path(path)
+        position = self.model.position(row) if row is not None else None
+        if position is None:
+            return False
 
-                icon = QIcon(pix)
-            else:
-                icon = QIcon(pixmap)
+        first, last = self.prefetch_window
+        return first <= position <= last
 
-            item = QListWidgetItem()
-            item.setIcon(icon)
-            item.setData(Qt.UserRole, path)
-            item.setSizeHint(QSize(self.thumb_size + 20, self.thumb_size + 20))
+    def cache_stats(self):
+        return self.thumbnail_cache.stats()
 
-            self.list_widget.addItem(item)
+    def commit_thumb_store(self):
+        if self.thumb_store:
+            self.thumb_store.commit()
 
     # -----------------------------
     # Rating System
     # -----------------------------
     
     def set_rating_for_selected(self, rating):
-        selected_items = self.list_widget.selectedItems()
-        if not selected_items:
+        rows = self.selected_rows()
+        if len(rows) == 0:
             return
 
-        for item in selected_items:
-            path = Path(item.data(Qt.UserRole))
+        # Update table (one vectorized write)
+        self.table.rating[rows] = rating
 
-            # 🔥 relative path inside current root
-            relative_path = str(Path(path).relative_to(self.root_path)).replace("\\", "/")
+        # 🔥 relative paths inside current root
+        changes = {
+            self.relative_path(self.table.paths[row]): rating
+            for row in rows
+        }
 
-            # Update image_data
-            for img in self.images_data:
-                if img["path"] == str(path):
-                    img["rating"] = rating
-                    break
+        # One batched, write-behind metadata update
+        self.metadata.set_ratings(changes)
 
-            self.metadata.set_rating(relative_path, rating)
-
-        self.apply_filters()
+        self.refresh_rows(rows)
 
     def set_rating_filter(self, ratings):
         self.rating_filter = ratings
@@ -242,28 +939,189 @@ class GalleryWidget(QWidget):
     # -----------------------------
 
     def sort_images(self, mode):
+        self.sort_mode = mode
+        self.display_images(self.sort_rows(np.sort(self.model.rows)))
+
+    @tracing.traced("gallery.sort_rows")
+    def sort_rows(self, rows):
+        """
+        Order rows (given in table order) by the current sort mode.
+        Ties keep table order, so the result is deterministic.
+        """
+        mode = self.sort_mode
+        table = self.table
+
         if mode == "Name A-Z":
-            self.filtered_data.sort(key=lambda x: x["name"])
+            rows = sorted(rows, key=table.name)
         elif mode == "Name Z-A":
-            self.filtered_data.sort(key=lambda x: x["name"], reverse=True)
+            rows = sorted(rows, key=table.name, reverse=True)
         elif mode == "Resolution High → Low":
-            self.filtered_data.sort(key=lambda x: x["resolution"], reverse=True)
+            rows = rows[np.argsort(-table.resolution[rows], kind="stable")]
         elif mode == "Resolution Low → High":
-            self.filtered_data.sort(key=lambda x: x["resolution"])
+            rows = rows[np.argsort(table.resolution[rows], kind="stable")]
+        elif mode in METRIC_SORTS:
+            # Unmeasured (NaN) rows end up last either way
+            name, descending = METRIC_SORTS[mode]
+            values = getattr(table, name)[rows]
+            rows = rows[np.argsort(-values if descending else values, kind="stable")]
+
+        rows = np.asarray(rows, dtype=np.int64)
+
+        # Duplicates view: members of a group sit next to each other
+        if self.duplicates_only:
+            rows = rows[np.argsort(table.group[rows], kind="stable")]
 
-        self.display_images(self.filtered_data)
+        return rows
 
     # -----------------------------
-    # Click
+    # Duplicates
     # -----------------------------
 
-    def on_item_clicked(self, item):
-        path = item.data(Qt.UserRole)
-        for img in self.images_data:
-            if img["path"] == path:
-                rating = img.get("rating", 0)
-                break
+    def find_duplicates(self):
+        """
+        Hash every loaded image in the background and flag
+        near-duplicate groups (results land in on_duplicates_found).
+        """
+        if self.root_path is None:
+            return
+
+        # Hashing / process pool modules load on first use only
+        from core.duplicate_worker import DuplicateWorker
+
+        self.stop_duplicate_search()
+
+        rows = self.table.live_rows()
+        self.duplicate_worker = DuplicateWorker(
+            [self.table.paths[row] for row in rows],
+            str(self.root_path),
+            self.metadata.resolve_store_file("hashes.db")
+        )
+        self.duplicate_worker.progress.connect(self.duplicates_progress)
+        self.duplicate_worker.groups_found.connect(self.on_duplicates_found)
+        self.duplicate_worker.start()
+
+    def stop_duplicate_search(self):
+        if self.duplicate_worker and self.duplicate_worker.isRunning():
+            self.duplicate_worker.requestInterruption()
+            self.duplicate_worker.wait()
+
+    def on_duplicates_found(self, groups):
+        if self.sender() is not self.duplicate_worker:
+            return  # search of a previous dataset
+
+        self.table.set_groups(groups)
+
+        if self.duplicates_only:
+            self.apply_filters()
+        self.list_view.viewport().update()  # DUP badges
+
+        self.duplicates_found.emit(len(groups))
+
+    # -----------------------------
+    # Quality Metrics
+    # -----------------------------
+
+    def compute_metrics(self):
+        """
+        Measure every loaded image in the background. Resumable:
+        images measured before (and unchanged) are skipped.
+        """
+        self.start_metrics(cached_only=False)
+
+    def start_metrics(self, cached_only):
+        if self.root_path is None:
+            return
+
+        store_path = self.metadata.resolve_store_file("metrics.db")
+        if cached_only and not store_path.exists():
+            return  # never measured: no stat pass, no empty metrics.db
+
+        from core.metrics_worker import MetricsWorker
+
+        self.stop_metrics()
+
+        rows = self.table.live_rows()
+        self.metrics_worker = MetricsWorker(
+            [self.table.paths[row] for row in rows],
+            str(self.root_path),
+            store_path,
+            cached_only
+        )
+        self.metrics_worker.metrics_ready.connect(self.on_metrics_ready)
+        if not cached_only:
+            self.metrics_worker.progress.connect(self.metrics_progress)
+            self.metrics_worker.finished_metrics.connect(self.metrics_finished)
+        self.metrics_worker.start()
+
+    def stop_metrics(self):
+        if self.metrics_worker and self.metrics_worker.isRunning():
+            self.metrics_worker.requestInterruption()
+            self.metrics_worker.wait()
+
+    def on_metrics_ready(self, metrics):
+        if self.sender() is not self.metrics_worker:
+            return  # run of a previous dataset
+
+        self.table.set_metrics(metrics)
+
+        # Visible set or order depends on metrics → re-diff the view
+        if self.metric_ranges or self.sort_mode in METRIC_SORTS:
+            self.apply_filters()
+
+    def set_metric_filter(self, name, low=None, high=None):
+        """
+        Keep rows whose metric lies in [low, high] (None = open end).
+        """
+        if low is None and high is None:
+            self.metric_ranges.pop(name, None)
         else:
-            rating = 0
+            self.metric_ranges[name] = (low, high)
+        self.apply_filters()
+
+    def set_duplicate_filter(self, enabled):
+        """
+        Show only flagged near-duplicates, grouped together.
+        """
+        self.duplicates_only = enabled
+        self.apply_filters()
+
+    # -----------------------------
+    # Selection / Click
+    # -----------------------------
+
+    def selected_rows(self):
+        """
+        Table rows of the selected items (O(selected)).
+        """
+        positions = [
+            index.row()
+            for index in self.list_view.selectionModel().selectedIndexes()
+        ]
+        return self.model.rows[positions]
+
+    def selected_paths(self):
+        return [self.table.paths[row] for row in self.selected_rows()]
+
+    def image_count(self):
+        return self.model.rowCount()
+
+    def on_current_changed(self, current, previous):
+        if current.isValid():
+            row = self.model.rows[current.row()]
+            self.image_selected.emit(self.table.record(row))
+
+    def neighbour_paths(self, path, radius=PREFETCH_RADIUS):
+        """
+        Paths around path in view order: next, previous, next+1, ...
+        """
+        row = self.table.row_for_path(path)
+        position = self.model.position(row) if row is not None else None
+        if position is None:
+            return []
 
-        self.image_selected.emit((path, rating))
\ No newline at end of file
+        paths = []
+        for offset in range(1, radius + 1):
+            for neighbour in (position + offset, position - offset):
+                if 0 <= neighbour < len(self.model.rows):
+                    paths.append(self.model.path(neighbour))
+        return paths
@@ -3,22 +3,32 @@ from PySide6.QtWidgets import (
     QFileDialog, QToolBar, QPushButton,
     QDockWidget, QComboBox, QLabel, QWidgetAction,
     QSizePolicy, QLineEdit, QToolButton, QMenu,
-    QCheckBox, QInputDialog, QMessageBox
+    QCheckBox, QInputDialog, QMessageBox, QProgressDialog
 )
 from PySide6.QtGui import QIcon
-import shutil
 from pathlib import Path
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QShortcut, QKeySequence
-from send2trash import send2trash
 
+from core import tracing
+from core.image_metrics import METRICS
 from core.settings_manager import SettingsManager
 from ui.settings_dialog import SettingsDialog
-from ui.gallery_widget import GalleryWidget
+from ui.gallery_widget import GalleryWidget, METRIC_SORTS
 from ui.preview_panel import PreviewPanel
 from ui.folder_panel import FolderPanel
 
 
+# Status bar phases: (label, span, value shown)
+TRACE_PHASES = [
+    ("load", "loader.run", "last_ms"),
+    ("cleanup", "gallery.loading_finished", "last_ms"),
+    ("filter", "gallery.apply_filters", "last_ms"),
+    ("display", "gallery.display_images", "last_ms"),
+    ("thumb", "thumbnail.decode", "avg_ms"),
+]
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -29,7 +39,7 @@ class MainWindow(QMainWindow):
         QMainWindow { background-color: #1e1e1e; }
         QLabel { color: white; font-size: 14px; }
         QComboBox { background-color: #2b2b2b; color: white; padding: 4px; }
-        QListWidget { background-color: #1e1e1e; color: white; }
+        QListView { background-color: #1e1e1e; color: white; }
         QToolBar { background-color: #2b2b2b; spacing: 10px; }
         QPushButton { background-color: #3a3a3a; color: white; padding: 5px; }
         QToolButton { background-color: #3a3a3a; color: white; padding: 5px; }
@@ -60,13 +70,25 @@ class MainWindow(QMainWindow):
 
         self.gallery.image_selected.connect(self.preview.load_image)
         self.preview.rating_callback = self.gallery.set_rating_for_selected
+        self.preview.neighbours_callback = self.gallery.neighbour_paths
         self.folder_panel.folders_changed.connect(
             self.gallery.filter_by_folders
         )
+        self.gallery.directories_added.connect(self.add_folders_to_tree)
+        self.gallery.duplicates_progress.connect(self.on_duplicates_progress)
+        self.gallery.duplicates_found.connect(self.on_duplicates_found)
+        self.gallery.metrics_progress.connect(self.on_metrics_progress)
+        self.gallery.metrics_finished.connect(self.on_metrics_finished)
+        self.gallery.directories_removed.connect(self.remove_folders_from_tree)
+        self.gallery.images_changed.connect(self.on_images_changed)
+        self.gallery.file_progress.connect(self.on_file_progress)
+        self.gallery.files_finished.connect(self.on_files_finished)
+        self.file_dialog = None
         
         # NEW
-        self.gallery.list_widget.model().rowsInserted.connect(self.update_image_count)
-        self.gallery.list_widget.model().rowsRemoved.connect(self.update_image_count)
+        self.gallery.model.rowsInserted.connect(self.update_image_count)
+        self.gallery.model.rowsRemoved.connect(self.update_image_count)
+        self.gallery.model.modelReset.connect(self.update_image_count)
 
         # ⭐ Rating shortcuts 1-5
         for i in range(1, 6):
@@ -92,6 +114,7 @@ class MainWindow(QMainWindow):
         self.dock.setFeatures(QDockWidget.DockWidgetMovable)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.dock)
         self.add_settings_button()
+        self.add_status_bar()
 
         base_path = self.settings_manager.get_dataset_base_path()
 
@@ -170,6 +193,24 @@ class MainWindow(QMainWindow):
         self.delete_selected_btn = QPushButton("Delete Selected")
         self.delete_selected_btn.clicked.connect(self.delete_selected_images)
         toolbar.addWidget(self.delete_selected_btn)
+
+        # Near-duplicates
+        toolbar.addSeparator()
+
+        self.find_duplicates_btn = QPushButton("Find Duplicates")
+        self.find_duplicates_btn.clicked.connect(self.find_duplicates)
+        toolbar.addWidget(self.find_duplicates_btn)
+
+        self.duplicates_checkbox = QCheckBox("Duplicates only")
+        self.duplicates_checkbox.toggled.connect(
+            self.gallery.set_duplicate_filter
+        )
+        toolbar.addWidget(self.duplicates_checkbox)
+
+        # Quality metrics
+        self.compute_metrics_btn = QPushButton("Compute Metrics")
+        self.compute_metrics_btn.clicked.connect(self.compute_metrics)
+        toolbar.addWidget(self.compute_metrics_btn)
                 
         # sort image
         toolbar.addSeparator()
@@ -180,7 +221,8 @@ class MainWindow(QMainWindow):
             "Name A-Z",
             "Name Z-A",
             "Resolution High → Low",
-            "Resolution Low → High"
+            "Resolution Low → High",
+            *METRIC_SORTS
         ])
         toolbar.addWidget(self.sort_dropdown)
         self.sort_dropdown.currentTextChanged.connect(
@@ -269,6 +311,44 @@ class MainWindow(QMainWindow):
         toolbar.addWidget(self.rating_button)
         # ---------------------------------------------------
 
+        # ---------- quality dropdown (min/max per metric) ----------
+        self.quality_button = QToolButton()
+        self.quality_button.setText("Quality ▼")
+        self.quality_button.setPopupMode(QToolButton.InstantPopup)
+
+        self.quality_menu = QMenu(self)
+        self.metric_inputs = {}
+
+        for name in METRICS:
+            row = QWidget()
+            row_layout = QHBoxLayout(row)
+            row_layout.setContentsMargins(6, 2, 6, 2)
+
+            label = QLabel(name.title())
+            label.setFixedWidth(80)
+            row_layout.addWidget(label)
+
+            inputs = []
+            for placeholder in ("min", "max"):
+                field = QLineEdit()
+                field.setPlaceholderText(placeholder)
+                field.setFixedWidth(70)
+                field.editingFinished.connect(
+                    lambda n=name: self.apply_metric_filter(n)
+                )
+                row_layout.addWidget(field)
+                inputs.append(field)
+
+            self.metric_inputs[name] = inputs
+
+            action = QWidgetAction(self)
+            action.setDefaultWidget(row)
+            self.quality_menu.addAction(action)
+
+        self.quality_button.setMenu(self.quality_menu)
+        toolbar.addWidget(self.quality_button)
+        # ---------------------------------------------------
+
         # image count
         toolbar.addSeparator()
         self.image_count_label = QLabel("Images: 0")
@@ -322,21 +402,38 @@ class MainWindow(QMainWindow):
         if self.gallery.root_path:
             self.gallery.load_folder(str(self.gallery.root_path))
 
+    def add_folders_to_tree(self, folders):
+        for folder in folders:
+            self.folder_panel.add_folder_to_tree(folder)
+
+    def remove_folders_from_tree(self, folders):
+        for folder in folders:
+            self.folder_panel.remove_folder_from_tree(folder)
+
+    def on_images_changed(self, paths):
+        self.preview.invalidate(paths)
+
+        # Shown image was replaced on disk → new pixmap and dimensions
+        if self.preview.current_path in set(paths):
+            row = self.gallery.table.row_for_path(self.preview.current_path)
+            if row is not None:
+                self.preview.load_image(self.gallery.table.record(row))
+
     def toggle_dock(self):
         self.dock.setVisible(not self.dock.isVisible())
 
     # file management
 
     def select_all_images(self):
-        self.gallery.list_widget.selectAll()
+        self.gallery.list_view.selectAll()
 
     def clear_selection(self):
-        self.gallery.list_widget.clearSelection()
+        self.gallery.list_view.clearSelection()
 
     def move_selected_images(self):
-        selected_items = self.gallery.list_widget.selectedItems()
+        selected_paths = self.gallery.selected_paths()
 
-        if not selected_items:
+        if not selected_paths:
             return
 
         # Ask for destination folder inside dataset
@@ -347,17 +444,8 @@ class MainWindow(QMainWindow):
         if not dest_folder:
             return
 
-        dest_path = Path(dest_folder)
-
-        for item in selected_items:
-            src_path = Path(item.data(Qt.UserRole))
-            try:
-                shutil.move(str(src_path), str(dest_path / src_path.name))
-            except Exception as e:
-                print("Move failed:", e)
-
-        # Reload gallery after move
-        self.gallery.load_folder(str(self.gallery.root_path))
+        started = self.gallery.move_paths(selected_paths, dest_folder)
+        self.show_file_progress("move", started, len(selected_paths))
 
     def create_new_folder(self):
         if not self.gallery.root_path:
@@ -395,15 +483,15 @@ class MainWindow(QMainWindow):
         self.folder_panel.add_folder_to_tree(str(new_path))
 
     def delete_selected_images(self):
-        selected_items = self.gallery.list_widget.selectedItems()
+        selected_paths = self.gallery.selected_paths()
 
-        if not selected_items:
+        if not selected_paths:
             return
 
         reply = QMessageBox.question(
             self,
             "Confirm Delete",
-            f"Send {len(selected_items)} selected image(s) to Recycle Bin?",
+            f"Send {len(selected_paths)} selected image(s) to Recycle Bin?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
@@ -411,16 +499,66 @@ class MainWindow(QMainWindow):
         if reply != QMessageBox.Yes:
             return
 
-        for item in selected_items:
-            path = Path(item.data(Qt.UserRole))
-            try:
-                send2trash(str(path))
-            except Exception as e:
-                print("Delete failed:", e)
+        started = self.gallery.delete_paths(selected_paths)
+        self.show_file_progress("delete", started, len(selected_paths))
+
+    # -----------------------------
+    # File Operations
+    # -----------------------------
+
+    # operation → (title, -ing, past tense)
+    FILE_OPERATIONS = {
+        "move": ("Move", "Moving", "moved"),
+        "delete": ("Delete", "Deleting", "deleted"),
+    }
+
+    def show_file_progress(self, operation, started, total):
+        title, running, _ = self.FILE_OPERATIONS[operation]
+
+        if not started:
+            QMessageBox.information(
+                self, title, "Another move or delete is still running."
+            )
+            return
+
+        # Window-modal: no rating / filtering of files in flight
+        self.file_dialog = QProgressDialog(
+            f"{running} {total} image(s)...", "Cancel", 0, total, self
+        )
+        self.file_dialog.setWindowModality(Qt.WindowModal)
+        self.file_dialog.setMinimumDuration(500)
+        self.file_dialog.canceled.connect(self.gallery.cancel_file_operation)
+
+    def on_file_progress(self, done, total):
+        if self.file_dialog:
+            self.file_dialog.setMaximum(total)
+            self.file_dialog.setValue(done)
+
+    def on_files_finished(self, operation, done, failed):
+        title, _, past = self.FILE_OPERATIONS[operation]
+
+        if self.file_dialog:
+            self.file_dialog.canceled.disconnect(self.gallery.cancel_file_operation)
+            self.file_dialog.close()
+            self.file_dialog = None
+
+        self.statusBar().showMessage(
+            f"{past.capitalize()} {done} image(s)"
+            + (f", {len(failed)} failed" if failed else ""),
+            8000
+        )
+
+        if failed:
+            details = "\n".join(
+                f"{Path(path).name}: {error}" for path, error in failed[:20]
+            )
+            if len(failed) > 20:
+                details += f"\n... and {len(failed) - 20} more"
+            QMessageBox.warning(
+                self, title,
+                f"{len(failed)} image(s) could not be {past}:\n\n{details}"
+            )
 
-        # Reload gallery
-        self.gallery.load_folder(str(self.gallery.root_path))
-        
     #Filter
 
     def handle_size_mode(self, text):
@@ -501,6 +639,127 @@ class MainWindow(QMainWindow):
 
         self.any_checkbox.blockSignals(False)
 
+    def closeEvent(self, event):
+        self.gallery.shutdown()
+        self.preview.shutdown()
+        super().closeEvent(event)
+
+    # -----------------------------
+    # Quality Metrics
+    # -----------------------------
+
+    def compute_metrics(self):
+        self.statusBar().showMessage("Measuring images...")
+        self.gallery.compute_metrics()
+
+    def on_metrics_progress(self, done, total):
+        self.statusBar().showMessage(f"Measuring images... {done}/{total}")
+
+    def on_metrics_finished(self):
+        self.statusBar().showMessage("Quality metrics up to date", 10000)
+
+    def apply_metric_filter(self, name):
+        bounds = []
+        for field in self.metric_inputs[name]:
+            try:
+                bounds.append(float(field.text()))
+            except ValueError:
+                bounds.append(None)  # empty / invalid = open end
+
+        self.gallery.set_metric_filter(name, *bounds)
+
+    # -----------------------------
+    # Duplicates
+    # -----------------------------
+
+    def find_duplicates(self):
+        self.statusBar().showMessage("Hashing images...")
+        self.gallery.find_duplicates()
+
+    def on_duplicates_progress(self, done, total):
+        self.statusBar().showMessage(f"Hashing images... {done}/{total}")
+
+    def on_duplicates_found(self, group_count):
+        self.statusBar().showMessage(
+            f"Found {group_count} near-duplicate groups", 10000
+        )
+
+    # -----------------------------
+    # Status Bar
+    # -----------------------------
+
+    def add_status_bar(self):
+        self.trace_label = QLabel()
+        self.statusBar().addPermanentWidget(self.trace_label)
+
+        trace_btn = QToolButton()
+        trace_btn.setText("⏱ Trace")
+        trace_btn.setToolTip("Export timing trace (Chrome / Perfetto JSON)")
+        trace_btn.clicked.connect(self.export_trace)
+        self.statusBar().addPermanentWidget(trace_btn)
+
+        self.cache_label = QLabel()
+        self.statusBar().addPermanentWidget(self.cache_label)
+
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(2000)
+        self.stats_timer.timeout.connect(self.update_cache_stats)
+        self.stats_timer.timeout.connect(self.update_trace_summary)
+        self.stats_timer.start()
+        self.update_cache_stats()
+        self.update_trace_summary()
+
+    def update_cache_stats(self):
+        stats = self.gallery.cache_stats()
+        mb = 1024 * 1024
+
+        self.cache_label.setText(
+            f"Thumbnails: {stats['entries']} · "
+            f"{stats['bytes'] / mb:.0f} / {stats['max_bytes'] / mb:.0f} MB · "
+            f"hit rate {stats['hit_rate']:.0%}"
+        )
+        self.cache_label.setToolTip(
+            f"Hits: {stats['hits']}\nMisses: {stats['misses']}"
+        )
+
+    def update_trace_summary(self):
+        summary = tracing.summary()
+
+        parts = [
+            f"{label} {summary[name][value]:.0f} ms"
+            for label, name, value in TRACE_PHASES
+            if name in summary
+        ]
+        self.trace_label.setText(" · ".join(parts))
+
+        lines = [f"{'phase':28} {'count':>7} {'total':>9} {'avg':>8} {'max':>8}"]
+        for name, s in sorted(summary.items()):
+            lines.append(
+                f"{name:28} {s['count']:7} {s['total_ms']:8.0f}ms "
+                f"{s['avg_ms']:7.1f}ms {s['max_ms']:7.1f}ms"
+            )
+        self.trace_label.setToolTip(
+            "<pre>" + "\n".join(lines) + "</pre>"
+        )
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", "trace.json", "Trace JSON (*.json)"
+        )
+        if not path:
+            return
+
+        try:
+            count = tracing.export_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+
+        self.statusBar().showMessage(
+            f"Trace with {count} spans written to {path} "
+            f"(open in ui.perfetto.dev)", 8000
+        )
+
     def update_image_count(self):
-        count = self.gallery.list_widget.count()
+        count = self.gallery.image_count()
         self.image_count_label.setText(f"Images: {count}")
\ No newline at end of file
@@ -0,0 +1,83 @@
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QPixmap
+from core import tracing
+from core.byte_lru import ByteLRU
+from core.image_decode import read_scaled_qimage
+from core.thumbnail_worker import ThumbnailPipeline
+
+
+class PreviewCache(QObject):
+    """
+    Scaled preview pixmaps, decoded in the background.
+
+    - request() puts the wanted image first, then its neighbours,
+      so stepping to the next/previous image is a cache hit
+    - Byte-bounded LRU: old previews fall out once the budget is used
+    - preview_ready(path, pixmap) fires for every finished decode
+      (null pixmap when the file could not be read)
+    """
+
+    preview_ready = Signal(str, QPixmap)
+
+    MAX_BYTES = 96 * 1024 * 1024
+    WORKERS = 2
+
+    def __init__(self, width, height, max_bytes=MAX_BYTES, parent=None):
+        super().__init__(parent)
+        self.width = width
+        self.height = height
+        self.lru = ByteLRU(max_bytes)
+
+        self.pipeline = ThumbnailPipeline(
+            0, max_workers=self.WORKERS, parent=self, decode=self.decode
+        )
+        self.pipeline.thumbnail_ready.connect(self.on_decoded)
+
+    @tracing.traced("preview.decode")
+    def decode(self, path):
+        """
+        Worker thread: reduced decode, small images enlarged to fit.
+        """
+        image = read_scaled_qimage(path, self.width, self.height)
+        if image.isNull():
+            return None
+
+        if image.width() < self.width and image.height() < self.height:
+            image = image.scaled(
+                self.width, self.height,
+                Qt.KeepAspectRatio, Qt.SmoothTransformation
+            )
+        return image
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+
+    def get(self, path):
+        return self.lru.get(path)
+
+    def invalidate(self, paths):
+        """
+        Drop previews of files that changed on disk.
+        """
+        for path in paths:
+            self.lru.discard(path)
+
+    def request(self, path, neighbours=()):
+        """
+        Decode path (if not cached) and prefetch the neighbours.
+        """
+        wanted = [p for p in (path, *neighbours) if p not in self.lru]
+        self.pipeline.schedule(wanted)
+
+    def shutdown(self):
+        self.pipeline.shutdown()
+
+    def on_decoded(self, path, image):
+        if image.isNull():
+            self.preview_ready.emit(path, QPixmap())
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self.lru.put(path, pixmap, image.sizeInBytes())
+        self.preview_ready.emit(path, pixmap)
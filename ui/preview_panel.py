@@ -2,15 +2,21 @@ from PySide6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout,
     QHBoxLayout, QPushButton
 )
-from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt
-from PIL import Image
+from ui.preview_cache import PreviewCache
 
 
 class PreviewPanel(QWidget):
     def __init__(self):
         super().__init__()
 
+        self.current_path = None
+        self.current_rating = 0
+
+        # Scaled previews of the current image and its neighbours
+        self.preview_cache = PreviewCache(700, 800, parent=self)
+        self.preview_cache.preview_ready.connect(self.on_preview_ready)
+
         self.image_label = QLabel()
         self.image_label.setAlignment(Qt.AlignCenter)
 
@@ -36,30 +42,47 @@ class PreviewPanel(QWidget):
 
         layout.addLayout(self.star_layout)
 
-    def load_image(self, data):
-        image_path, rating = data
+    def load_image(self, record):
+        """
+        Show a gallery record. The pixmap comes from the preview cache;
+        on a miss it is decoded in the background and shown when ready.
+        """
+        image_path = record["path"]
+        rating = record["rating"]
+
+        self.current_path = image_path
         self.current_rating = rating
         self.update_stars()
-        pixmap = QPixmap(image_path)
-
-        self.image_label.setPixmap(
-            pixmap.scaled(
-                700,
-                800,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-        )
-
-        img = Image.open(image_path)
-        width, height = img.size
 
+        # Dimensions are already known from the scan
         self.info_label.setText(
             f"Path: {image_path}\n"
-            f"Resolution: {width} x {height}\n"
+            f"Resolution: {record['width']} x {record['height']}\n"
             f"Rating: {rating}"
         )
-    
+
+        neighbours = []
+        if hasattr(self, "neighbours_callback"):
+            neighbours = self.neighbours_callback(image_path)
+
+        pixmap = self.preview_cache.get(image_path)
+        if pixmap is not None:
+            self.image_label.setPixmap(pixmap)
+        else:
+            self.image_label.clear()
+
+        self.preview_cache.request(image_path, neighbours)
+
+    def on_preview_ready(self, path, pixmap):
+        if path == self.current_path:
+            self.image_label.setPixmap(pixmap)
+
+    def invalidate(self, paths):
+        self.preview_cache.invalidate(paths)
+
+    def shutdown(self):
+        self.preview_cache.shutdown()
+
     def set_rating(self, rating):
         self.current_rating = rating
         self.update_stars()
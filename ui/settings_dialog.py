@@ -1,7 +1,7 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel,
     QLineEdit, QPushButton, QFileDialog,
-    QHBoxLayout
+    QHBoxLayout, QComboBox, QCheckBox, QSpinBox
 )
 from PySide6.QtCore import Qt
 
@@ -33,6 +33,34 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(path_layout)
 
+        # Ratings storage (applies on next dataset load)
+        layout.addWidget(QLabel("Ratings Storage:"))
+
+        self.backend_dropdown = QComboBox()
+        self.backend_dropdown.addItem("JSON files", "json")
+        self.backend_dropdown.addItem("SQLite database", "sqlite")
+        self.backend_dropdown.setCurrentIndex(
+            max(0, self.backend_dropdown.findData(
+                self.settings_manager.get_metadata_backend()
+            ))
+        )
+        layout.addWidget(self.backend_dropdown)
+
+        self.resolution_badge_check = QCheckBox("Show resolution on thumbnails")
+        self.resolution_badge_check.setChecked(
+            self.settings_manager.get_show_resolution_badge()
+        )
+        layout.addWidget(self.resolution_badge_check)
+
+        # Memory for decoded thumbnails (least recently used go first)
+        layout.addWidget(QLabel("Thumbnail Memory Budget (MB):"))
+
+        self.cache_spin = QSpinBox()
+        self.cache_spin.setRange(32, 16384)
+        self.cache_spin.setSingleStep(64)
+        self.cache_spin.setValue(self.settings_manager.get_thumbnail_cache_mb())
+        layout.addWidget(self.cache_spin)
+
         save_btn = QPushButton("Save")
         save_btn.clicked.connect(self.save_settings)
         layout.addWidget(save_btn)
@@ -51,4 +79,13 @@ class SettingsDialog(QDialog):
         self.settings_manager.set_dataset_base_path(
             self.path_input.text()
         )
+        self.settings_manager.set_metadata_backend(
+            self.backend_dropdown.currentData()
+        )
+        self.settings_manager.set_show_resolution_badge(
+            self.resolution_badge_check.isChecked()
+        )
+        self.settings_manager.set_thumbnail_cache_mb(
+            self.cache_spin.value()
+        )
         self.accept()
\ No newline at end of file
@@ -0,0 +1,107 @@
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+
+
+# ---------------------------------------------------------
+# Overlay Painters
+# ---------------------------------------------------------
+#
+# Overlays are drawn by the delegate at paint time, on top of the
+# shared cached thumbnail. They read straight from the ImageTable
+# row, so a rating or flag change only needs a repaint - the
+# thumbnail pixmap itself is never copied or modified.
+#
+# An overlay is any object with:
+#     paint(painter, rect, table, row)
+# where rect is the area the thumbnail was drawn into.
+
+
+class RatingOverlay:
+    """
+    "3★" in the top-left corner of rated images.
+    """
+
+    def __init__(self):
+        self.font = QFont("Arial", 20, QFont.Bold)
+        self.color = QColor("yellow")
+
+    def paint(self, painter, rect, table, row):
+        rating = int(table.rating[row])
+        if rating <= 0:
+            return
+
+        painter.setPen(self.color)
+        painter.setFont(self.font)
+        painter.drawText(rect.x() + 10, rect.y() + 30, f"{rating}★")
+
+
+class Badge:
+    """
+    Small text pill in a corner of the thumbnail.
+    Subclasses return the text (or None for no badge).
+    """
+
+    MARGIN = 4
+    PADDING = 3
+
+    def __init__(self, corner=Qt.BottomRightCorner, color="white", background="#cc202020"):
+        self.corner = corner
+        self.font = QFont("Arial", 8, QFont.Bold)
+        self.metrics = QFontMetrics(self.font)
+        self.color = QColor(color)
+        self.background = QColor(background)
+
+    def text(self, table, row):
+        return None
+
+    def paint(self, painter, rect, table, row):
+        text = self.text(table, row)
+        if not text:
+            return
+
+        width = self.metrics.horizontalAdvance(text) + 2 * self.PADDING
+        height = self.metrics.height() + self.PADDING
+
+        if self.corner in (Qt.TopLeftCorner, Qt.BottomLeftCorner):
+            x = rect.left() + self.MARGIN
+        else:
+            x = rect.right() - self.MARGIN - width
+
+        if self.corner in (Qt.TopLeftCorner, Qt.TopRightCorner):
+            y = rect.top() + self.MARGIN
+        else:
+            y = rect.bottom() - self.MARGIN - height
+
+        badge = QRect(x, y, width, height)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.background)
+        painter.drawRoundedRect(badge, 3, 3)
+
+        painter.setPen(self.color)
+        painter.setFont(self.font)
+        painter.drawText(badge, Qt.AlignCenter, text)
+
+
+class ResolutionBadge(Badge):
+    """
+    "1024×768" in the bottom-right corner.
+    """
+
+    def text(self, table, row):
+        return f"{int(table.width[row])}×{int(table.height[row])}"
+
+
+class FlagBadge(Badge):
+    """
+    Label shown while a bit is set in the table's flags column
+    (e.g. FLAG_DUPLICATE).
+    """
+
+    def __init__(self, flag, label, corner=Qt.TopRightCorner, background="#ccc0392b"):
+        super().__init__(corner, background=background)
+        self.flag = flag
+        self.label = label
+
+    def text(self, table, row):
+        return self.label if table.flags[row] & self.flag else None